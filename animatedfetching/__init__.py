@@ -4,9 +4,22 @@ AnimatedFetching - A terminal fetch program with animated GIF support
 
 __version__ = "1.0.0"
 
-from .main import main, AnimatedFetching
-from .config import Config
-from .sysinfo import SystemInfo
-from .animation import AnimatedGIF
-
 __all__ = ['main', 'AnimatedFetching', 'Config', 'SystemInfo', 'AnimatedGIF']
+
+# Public names are imported on first use to keep startup fast
+_EXPORTS = {
+    'main': '.main',
+    'AnimatedFetching': '.main',
+    'Config': '.config',
+    'SystemInfo': '.sysinfo',
+    'AnimatedGIF': '.animation',
+}
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -4,72 +4,517 @@ Animated GIF display module for AnimatedFetching
 """
 
 import os
+import sys
 import time
-from threading import Thread, Event
-from PIL import Image
-from rich.console import Console
-from rich.align import Align
+from threading import Thread, Event, Condition
+
+# NumPy, Pillow and the encoder are imported where frames are decoded, so
+# frames served from the cache never load them
+from .terminal import MODES, COLOR_DEPTHS, detect_color_depth
+
+# Resampling filters for shrinking frames, by name
+RESAMPLE = ('nearest', 'box', 'bilinear', 'hamming', 'bicubic', 'lanczos')
+
+# Sources at least this many times the target size are first shrunk by a
+# whole factor with a cheap box reduction, then resampled
+REDUCING_GAP = 2.0
+
+# Like browsers, treat frame delays under 20ms as 100ms when sampling frames
+MIN_FRAME_DURATION = 0.02
+SHORT_FRAME_DURATION = 0.1
+
+
+class StreamingFrames:
+    """Bounded window of encoded frames, decoded ahead of the playhead
+
+    A background producer keeps the frames from the playhead onwards
+    decoded. Past the window, the frame furthest behind the playhead is
+    evicted, so frames about to be shown are never dropped and decoded
+    again out of order; an evicted frame requested later is decoded on
+    demand. Frames are only read from the display thread.
+    """
+    
+    def __init__(self, animation, frame_count, window):
+        self.animation = animation
+        self.frame_count = frame_count
+        self.window = max(1, min(window, frame_count))
+        self.playhead = 0
+        self.evicted = 0
+        self._frames = {}
+        self._deltas = {}
+        self._changed = Condition()
+        self._reader = None  # Separate decoder for on-demand frames
+    
+    def __len__(self):
+        return self.frame_count
+    
+    def __getitem__(self, index):
+        if not 0 <= index < self.frame_count:
+            raise IndexError("frame index out of range")
+        
+        with self._changed:
+            self.playhead = index
+            self._changed.notify_all()
+            frame = self._frames.get(index)
+            if frame is not None:
+                return frame
+        
+        # Evicted or not decoded yet: decode it here instead of waiting
+        if self._reader is None:
+            self._reader = self.animation._open_image()
+        frame = self.animation._decode_frame(self._reader, index)
+        self.put(index, frame)
+        return frame
+    
+    def __iter__(self):
+        for index in range(self.frame_count):
+            yield self[index]
+    
+    def put(self, index, frame, delta=None):
+        """Store a decoded frame, evicting those furthest behind the playhead past the window"""
+        with self._changed:
+            self._frames[index] = frame
+            if delta is not None:
+                self._deltas[index] = delta
+            while len(self._frames) > self.window:
+                # The window ahead holds at most `window` frames, so this
+                # is always one outside it
+                evicted = max(self._frames, key=lambda i: (i - self.playhead) % self.frame_count)
+                del self._frames[evicted]
+                self._deltas.pop(evicted, None)
+                self.evicted += 1
+            self._changed.notify_all()
+    
+    def delta(self, index):
+        """Get the delta into a resident frame, or None if it has none"""
+        with self._changed:
+            return self._deltas.get(index)
+    
+    def next_missing(self, stop_event):
+        """Wait for a frame in the window ahead of the playhead that needs decoding"""
+        with self._changed:
+            while not stop_event.is_set():
+                for offset in range(self.window):
+                    index = (self.playhead + offset) % self.frame_count
+                    if index not in self._frames:
+                        return index
+                self._changed.wait(0.5)
+        return None
+    
+    def resident(self):
+        """Get the decoded frames and deltas currently held, keyed by index"""
+        with self._changed:
+            return dict(self._frames), dict(self._deltas)
+    
+    def wake(self):
+        """Wake a producer blocked waiting for work"""
+        with self._changed:
+            self._changed.notify_all()
+    
+    def memory_bytes(self):
+        """Bytes held by the resident frames and deltas"""
+        frames, deltas = self.resident()
+        return (sum(map(sys.getsizeof, frames.values()))
+                + sum(sys.getsizeof(delta.text) for delta in deltas.values()))
+
+
+class FrameScheduler:
+    """Yields frame indices at absolute deadlines on a monotonic clock
+
+    Frame i is due at the start time plus the durations of all frames
+    before it, so time spent rendering never accumulates as drift. When
+    playback falls behind, frames whose slot has already passed are
+    dropped rather than shown late.
+    """
+    
+    def __init__(self, frame_count, frame_duration, plays=None, budget=None,
+                 clock=time.monotonic, sleep=time.sleep):
+        self.frame_count = frame_count
+        self.frame_duration = frame_duration  # Callable: index -> seconds
+        self.plays = plays  # Times through the frames, None to loop forever
+        self.budget = budget  # Seconds before stopping, None for no limit
+        self.clock = clock
+        self.sleep = sleep
+        self.stopped = False
+        self.woken = False
+        self.shown = 0
+        self.dropped = 0
+        self.scheduled = 0.0
+        self.elapsed = 0.0
+    
+    def _wait(self, deadline):
+        """Sleep until the deadline, or until stopped
+        
+        The sleep may return early, for example to handle input, and is
+        simply called again for the rest of the time.
+        """
+        remaining = deadline - self.clock()
+        while remaining > 0 and not (self.stopped or self.woken):
+            self.sleep(remaining)
+            remaining = deadline - self.clock()
+    
+    def stop(self):
+        """End playback without showing another frame"""
+        self.stopped = True
+    
+    def wake(self):
+        """Yield the frame on screen again right away, so it can be redrawn"""
+        self.woken = True
+    
+    def __iter__(self):
+        if self.frame_count == 0:
+            return
+        
+        start = self.clock()
+        end = None if self.budget is None else start + self.budget
+        deadline = start
+        index = on_screen = 0
+        plays = 0
+        try:
+            while True:
+                self._wait(deadline)
+                if self.stopped:
+                    return
+                if self.woken:
+                    self.woken = False
+                    yield on_screen
+                    # Whatever woke us may have shortened the frame on screen
+                    # (an idle tick once a command starts), so the next one
+                    # can come sooner, but never later than planned
+                    deadline = min(deadline, self.clock() + self.frame_duration(on_screen))
+                    continue
+                yield index
+                self.shown += 1
+                on_screen = index
+                
+                # Advance to the next frame whose slot hasn't fully passed
+                while True:
+                    deadline += self.frame_duration(index)
+                    index += 1
+                    if index == self.frame_count:
+                        index = 0
+                        plays += 1
+                    finished = self.plays is not None and plays >= self.plays
+                    if finished or (end is not None and deadline >= end):
+                        # Leave the last frame up for the rest of its slot
+                        if end is not None:
+                            deadline = min(deadline, end)
+                        self._wait(deadline)
+                        return
+                    if self.clock() < deadline + self.frame_duration(index):
+                        break
+                    self.dropped += 1
+        finally:
+            self.scheduled = deadline - start
+            self.elapsed = self.clock() - start
+    
+    def stats(self):
+        """Get shown and dropped frame counts with actual and target fps"""
+        frames = self.shown + self.dropped
+        return {
+            'shown': self.shown,
+            'dropped': self.dropped,
+            'elapsed': self.elapsed,
+            'actual_fps': self.shown / self.elapsed if self.elapsed else 0.0,
+            'target_fps': frames / self.scheduled if self.scheduled else 0.0,
+        }
+
 
 class AnimatedGIF:
     """Handles animated GIF display in terminal"""
     
-    def __init__(self, gif_path, width=40, fps=10):
+    def __init__(self, gif_path, width=40, fps=10, cache=None, streaming=False, window=32, mode="block",
+                 color_depth="auto", lru=8, resample="bicubic", max_source_pixels=None, max_frames=None,
+                 max_decode_mb=None):
+        if mode not in MODES:
+            print(f"Warning: Unknown animation mode '{mode}', using 'block'")
+            mode = "block"
+        color_depth = str(color_depth)
+        if color_depth != "auto" and color_depth not in COLOR_DEPTHS:
+            print(f"Warning: Unknown color depth '{color_depth}', detecting it instead")
+            color_depth = "auto"
+        if color_depth == "auto":
+            color_depth = detect_color_depth()
+        if resample not in RESAMPLE:
+            print(f"Warning: Unknown resample filter '{resample}', using 'bicubic'")
+            resample = "bicubic"
+        
         self.gif_path = os.path.expanduser(gif_path)
         self.width = width
         self.fps = fps
+        self.mode = mode
+        self.color_depth = color_depth
+        self.lru = lru
+        self.resample = resample
+        # Past any of these, _load_frames samples frames at fps rather than keeping them all
+        self.max_source_pixels = max_source_pixels
+        self.max_frames = max_frames
+        self.max_decode_bytes = max(1, int(max_decode_mb * 1024 * 1024)) if max_decode_mb else None
+        self.cache = cache
+        self.cache_key = None
         self.frames = []
         self.frame_durations = []  # Store duration for each frame
+        self.raw_frame_bytes = []  # Per-frame size before run encoding
+        self.deltas = []  # Changed spans from the previous frame, or None
+        self.plays = 1  # Times the GIF asks to be played, None for forever
+        self.frames_decoded = 0  # Frames decoded from the GIF rather than the cache
+        self.source_frames = None  # Frames in the GIF, once it has been decoded
+        self.load_times = {}  # Seconds spent in each loading step
         self.stop_event = Event()
         self.thread = None
         self.current_frame = 0
         
         if os.path.exists(self.gif_path):
-            self._load_frames()
+            if self._load_cached_frames():
+                pass
+            elif streaming:
+                self._start_streaming(window)
+            else:
+                self._load_frames()
+                self._store_cached_frames()
+    
+    def _load_cached_frames(self):
+        """Load pre-rendered frames from the on-disk cache, if present"""
+        if self.cache is None:
+            return False
+        
+        try:
+            self.cache_key = self.cache.key(
+                self.gif_path, self.width, self.mode, self.color_depth,
+                (self.resample, self.max_source_pixels, self.max_frames, self.max_decode_bytes, self.fps)
+            )
+        except OSError:
+            return False
+        
+        start = time.perf_counter()
+        cached = self.cache.load(self.cache_key)
+        self.load_times['cache'] = time.perf_counter() - start
+        if cached is None:
+            return False
+        
+        self.frames, self.frame_durations, self.raw_frame_bytes, self.deltas, self.plays = cached
+        return True
+    
+    def _store_cached_frames(self, frames=None, deltas=None):
+        """Save freshly rendered frames to the on-disk cache"""
+        frames = self.frames if frames is None else frames
+        deltas = self.deltas if deltas is None else deltas
+        if self.cache is None or self.cache_key is None or not len(frames):
+            return
+        if hasattr(frames, 'delta'):
+            # Indexed frames are encoded one at a time; only the LRU stays resident afterwards
+            deltas = [frames.delta(index) for index in range(len(frames))]
+            frames = list(frames)
+        self.cache.store(
+            self.cache_key, frames, self.frame_durations, self.raw_frame_bytes, deltas, self.plays
+        )
+    
+    def _open_image(self):
+        """Open the GIF for decoding"""
+        from PIL import Image
+        return Image.open(self.gif_path)
+    
+    def _target_size(self, img):
+        """Get the (width, height) in pixels that frames are shrunk to"""
+        aspect_ratio = img.height / img.width
+        new_height = int(self.width * aspect_ratio * 0.5)  # 0.5 for char aspect ratio
+        if self.mode == "half":
+            # Two pixel rows per terminal row, same on-screen size
+            new_height *= 2
+        return self.width, new_height
+    
+    def _resize_frame(self, img):
+        """Resize the current GIF frame to the target width as an RGB array"""
+        import numpy as np
+        from PIL import Image
+        
+        size = self._target_size(img)
+        if self.resample == "nearest":
+            # Picks source pixels directly, without converting the whole frame
+            frame = img.resize(size, Image.NEAREST)
+        else:
+            # Palette frames can only be resized nearest-neighbour, so convert first
+            frame = img.convert('RGB').resize(
+                size, getattr(Image, self.resample.upper()), reducing_gap=REDUCING_GAP
+            )
+        return np.asarray(frame.convert('RGB'))
+    
+    @staticmethod
+    def _frame_duration(img):
+        """Get the current frame's duration in seconds"""
+        # Duration is in milliseconds, default to 100ms if not specified
+        return img.info.get('duration', 100) / 1000.0
+    
+    @staticmethod
+    def _play_count(img):
+        """Get how many times the GIF plays, or None to loop forever"""
+        # Without a loop extension a GIF plays once; a loop count of 0 means forever
+        loop = img.info.get('loop')
+        if loop is None:
+            return 1
+        return None if loop == 0 else loop + 1
+    
+    def _decode_rgb(self, img, index):
+        """Decode a single frame to RGB, recording its metadata on first sight"""
+        from .ansi import cell_bytes
+        
+        img.seek(index)
+        rgb = self._resize_frame(img)
+        self.frames_decoded += 1
+        if self.frame_durations[index] is None:
+            self.frame_durations[index] = self._frame_duration(img)
+            self.raw_frame_bytes[index] = cell_bytes(rgb[None], self.mode)[0]
+        return rgb
+    
+    def _decode_frame(self, img, index):
+        """Decode and encode a single frame"""
+        from .ansi import encode_rgb
+        return encode_rgb(self._decode_rgb(img, index), self.mode, self.color_depth)
+    
+    def _start_streaming(self, window):
+        """Show frame 0 right away and decode the rest in the background
+        
+        Every frame is streamed: the decode caps only apply to
+        _load_frames, since the window already bounds what is held here.
+        """
+        try:
+            img = self._open_image()
+            self.plays = self._play_count(img)
+            frame_count = getattr(img, 'n_frames', 1)
+            # Metadata fills in as each frame is decoded for the first time
+            self.frame_durations = [None] * frame_count
+            self.raw_frame_bytes = [None] * frame_count
+            frames = StreamingFrames(self, frame_count, window)
+            frames.put(0, self._decode_frame(img, 0))
+        except Exception as e:
+            print(f"Error loading GIF: {e}")
+            return
+        
+        self.frames = frames
+        if len(frames) > 1:
+            self.stop_event.clear()
+            self.thread = Thread(target=self._produce_frames, args=(img,), daemon=True)
+            self.thread.start()
+    
+    def _produce_frames(self, img):
+        """Background producer: keep the window ahead of the playhead decoded"""
+        from .ansi import encode_rgb, encode_transition
+        
+        frames = self.frames
+        stored = False
+        previous = (None, None)
+        try:
+            while True:
+                index = frames.next_missing(self.stop_event)
+                if index is None:
+                    break
+                
+                # Sequential frames also get the delta from the one before
+                rgb = self._decode_rgb(img, index)
+                if previous[0] == (index - 1) % len(frames):
+                    frame, delta = encode_transition(previous[1], rgb, self.mode, depth=self.color_depth)
+                else:
+                    frame, delta = encode_rgb(rgb, self.mode, self.color_depth), None
+                frames.put(index, frame, delta)
+                previous = (index, rgb)
+                
+                # A GIF that fits the window without evictions can go to the cache
+                if not stored and frames.evicted == 0:
+                    resident, deltas = frames.resident()
+                    if len(resident) == len(frames):
+                        stored = True
+                        self._store_cached_frames(
+                            [resident[i] for i in range(len(frames))],
+                            [deltas.get(i) for i in range(len(frames))]
+                        )
+        except Exception as e:
+            print(f"Error decoding GIF: {e}")
+    
+    def stop(self):
+        """Stop the background frame producer"""
+        self.stop_event.set()
+        if isinstance(self.frames, StreamingFrames):
+            self.frames.wake()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+    
+    def _frame_limit(self, img, frame_count, frame_bytes):
+        """Get how many frames _load_frames may keep, and whether to sample at fps
+        
+        Past max_frames, or with more resized frames than fit in
+        max_decode_mb, frames are sampled. So are sources larger than
+        max_source_pixels, where every frame kept costs a full-size resize.
+        """
+        limit = frame_count
+        if self.max_frames:
+            limit = min(limit, self.max_frames)
+        if self.max_decode_bytes:
+            limit = min(limit, self.max_decode_bytes // max(1, frame_bytes))
+        limit = max(1, limit)
+        large = self.max_source_pixels and img.width * img.height > self.max_source_pixels
+        return limit, bool(limit < frame_count or large)
     
     def _load_frames(self):
-        """Load and convert GIF frames to ASCII/block characters"""
+        """Load and convert GIF frames to ASCII/block characters
+        
+        Frames are resized straight into one preallocated stack. When the
+        GIF is past a cap, only frames at most fps apart are kept (and
+        never more than the cap), each lasting until the next kept one.
+        Pillow still has to decompress the skipped frames, since GIF frames
+        build on each other, but they are never resized or stored.
+        """
+        import numpy as np
+        from .ansi import IndexedFrames, cell_bytes
+        
         try:
-            img = Image.open(self.gif_path)
-            frame_count = 0
+            start = time.perf_counter()
+            img = self._open_image()
+            self.plays = self._play_count(img)
+            frame_count = getattr(img, 'n_frames', 1)
+            self.source_frames = frame_count
+            width, height = self._target_size(img)
+            limit, sample = self._frame_limit(img, frame_count, width * height * 3)
             
-            while True:
-                try:
-                    # Get frame duration (in milliseconds, default to 100ms if not specified)
-                    duration = img.info.get('duration', 100) / 1000.0  # Convert to seconds
+            # Kept frames are at least step frames and interval seconds apart
+            step = -(-frame_count // limit)
+            interval = 1.0 / self.fps if sample and self.fps else 0.0
+            stack = np.empty((limit, height, width, 3), dtype=np.uint8)
+            kept = last = 0
+            elapsed = 0.0  # Seconds since the last kept frame started
+            
+            for index in range(frame_count):
+                if index:
+                    img.seek(index)
+                duration = self._frame_duration(img)
+                shown_for = duration if duration >= MIN_FRAME_DURATION else SHORT_FRAME_DURATION
+                if index == 0 or (kept < limit and index - last >= step and elapsed >= interval):
+                    stack[kept] = self._resize_frame(img)
                     self.frame_durations.append(duration)
-                    
-                    # Resize frame
-                    aspect_ratio = img.height / img.width
-                    new_height = int(self.width * aspect_ratio * 0.5)  # 0.5 for char aspect ratio
-                    frame = img.resize((self.width, new_height))
-                    
-                    # Convert to ASCII art representation
-                    ascii_frame = self._image_to_ascii(frame)
-                    self.frames.append(ascii_frame)
-                    
-                    frame_count += 1
-                    img.seek(frame_count)
-                except EOFError:
-                    break
+                    kept, last, elapsed = kept + 1, index, shown_for
+                else:
+                    # A skipped frame's time goes to the kept frame before it
+                    self.frame_durations[-1] += duration
+                    elapsed += shown_for
+            
+            stack = stack[:kept]
+            self.frames_decoded = kept
+            decoded = time.perf_counter()
+            self.load_times['decode'] = decoded - start
+            
+            # Convert the whole frame stack to block characters in one batch
+            if kept:
+                self.frames = IndexedFrames.from_stack(stack, self.mode, self.color_depth, self.lru)
+                self.raw_frame_bytes = cell_bytes(stack, self.mode)
+            self.load_times['convert'] = time.perf_counter() - decoded
         except Exception as e:
             print(f"Error loading GIF: {e}")
     
     def _image_to_ascii(self, image):
         """Convert image to colored block characters"""
-        # Convert to RGB
-        image = image.convert('RGB')
-        pixels = image.load()
-        
-        lines = []
-        for y in range(image.height):
-            line = ""
-            for x in range(image.width):
-                r, g, b = pixels[x, y]
-                # Use block character with color
-                line += f"\033[38;2;{r};{g};{b}m█\033[0m"
-            lines.append(line)
-        
-        return "\n".join(lines)
+        import numpy as np
+        from .ansi import encode_rgb
+        return encode_rgb(np.asarray(image.convert('RGB')), self.mode, self.color_depth)
     
     def get_static_frame(self):
         """Get first frame for static display"""
@@ -83,22 +528,72 @@ class AnimatedGIF:
             return self.frames[self.current_frame]
         return ""
     
+    def get_current_delta(self):
+        """Get the changed spans from the previous frame to the current one
+
+        Returns None when the current frame has to be repainted in full.
+        """
+        if hasattr(self.frames, 'delta'):
+            return self.frames.delta(self.current_frame)
+        if self.current_frame < len(self.deltas):
+            return self.deltas[self.current_frame]
+        return None
+    
     def get_frame_count(self):
         """Get total number of frames"""
         return len(self.frames)
     
+    def memory_bytes(self):
+        """Get the bytes held in memory for frames and deltas
+        
+        Frames loaded from the cache count their memory-mapped size.
+        """
+        if hasattr(self.frames, 'memory_bytes'):
+            total = self.frames.memory_bytes()
+        else:
+            total = sum(map(sys.getsizeof, self.frames))
+        if hasattr(self.deltas, 'memory_bytes'):
+            total += self.deltas.memory_bytes()
+        else:
+            total += sum(sys.getsizeof(delta.text) for delta in self.deltas if delta is not None)
+        return total
+    
+    def encoding_stats(self):
+        """Get per-frame output sizes before and after run encoding"""
+        # Encoding first also decodes any streamed frames not yet seen
+        encoded = [len(frame.encode('utf-8')) for frame in self.frames]
+        raw = self.raw_frame_bytes
+        return {
+            'frames': len(encoded),
+            'raw_bytes': raw,
+            'encoded_bytes': encoded,
+            'raw_total': sum(raw),
+            'encoded_total': sum(encoded),
+            'ratio': sum(encoded) / sum(raw) if sum(raw) else 0.0,
+        }
+    
+    def frame_duration(self, index):
+        """Get a frame's duration, falling back to fps-based timing"""
+        duration = self.frame_durations[index] if index < len(self.frame_durations) else None
+        if not duration:
+            return 1.0 / self.fps
+        return duration
+    
+    def scheduler(self, budget=None, loop=False, clock=time.monotonic, sleep=time.sleep):
+        """Create a scheduler that plays this animation's frames on time
+        
+        With loop, play forever regardless of the GIF's own loop count.
+        """
+        plays = None if loop else self.plays
+        return FrameScheduler(len(self.frames), self.frame_duration, plays, budget, clock, sleep)
+    
     def next_frame(self):
         """Advance to next frame and return its duration"""
         if not self.frames:
             return 0.1
         
         self.current_frame = (self.current_frame + 1) % len(self.frames)
-        
-        # Use frame-specific duration or fallback to fps-based timing
-        if self.frame_durations and self.current_frame < len(self.frame_durations):
-            return self.frame_durations[self.current_frame]
-        else:
-            return 1.0 / self.fps
+        return self.frame_duration(self.current_frame)
     
     def reset(self):
         """Reset animation to first frame"""
@@ -0,0 +1,582 @@
+#!/usr/bin/env python3
+"""
+ANSI frame conversion module for AnimatedFetching
+"""
+
+import sys
+from collections import OrderedDict
+
+import numpy as np
+
+from .terminal import (
+    BLOCK, UPPER_HALF, RESET, SYNC_BEGIN, SYNC_END, GLYPHS, MODES, COLOR_DEPTHS,
+    Delta, detect_color_depth,
+)
+
+# Levels of the xterm-256 color cube and the start of its grayscale ramp
+_CUBE_LEVELS = (0, 95, 135, 175, 215, 255)
+_GRAY_BASE = 232
+
+# xterm's default RGB values for the 16 basic ANSI colors
+_ANSI16 = (
+    (0, 0, 0), (205, 0, 0), (0, 205, 0), (205, 205, 0),
+    (0, 0, 238), (205, 0, 205), (0, 205, 205), (229, 229, 229),
+    (127, 127, 127), (255, 0, 0), (0, 255, 0), (255, 255, 0),
+    (92, 92, 255), (255, 0, 255), (0, 255, 255), (255, 255, 255),
+)
+
+# Quantization lookup tables are indexed by the top bits of each channel
+_LUT_BITS = 5
+
+# Bytes of one cell in the original per-cell form, excluding channel digits:
+# "\033[38;2;" + ";" + ";" + "m" + "█" + "\033[0m"
+_CELL_OVERHEAD = 7 + 2 + 1 + len(BLOCK.encode()) + 4
+# Half-block cells also carry ";48;2;" + ";" + ";" for the bottom pixel
+_HALF_CELL_OVERHEAD = _CELL_OVERHEAD + 6 + 2
+
+
+def _digit_table():
+    """Build ";" plus the decimal digits of 0-255, each padded with NULs to four bytes
+
+    Each entry is also viewed as one uint32 word, so byte matrices are
+    filled a word at a time.
+    """
+    digits = np.zeros((256, 4), dtype=np.uint8)
+    for value in range(256):
+        text = b";" + str(value).encode()
+        digits[value, :len(text)] = list(text)
+    return digits
+
+
+_DIGITS = _digit_table()
+_DIGIT_COUNT = np.count_nonzero(_DIGITS, axis=1) - 1
+_DIGIT_WORDS = _DIGITS.view(np.uint32).ravel()
+
+
+def _palette_table():
+    """Map every exact xterm-256 cube and grayscale color to its index"""
+    lookup = {}
+    for index, value in enumerate(range(8, 248, 10)):
+        lookup[(value << 16) | (value << 8) | value] = _GRAY_BASE + index
+    # Cube entries win over the ramp; both are exact, so either is correct
+    for r, red in enumerate(_CUBE_LEVELS):
+        for g, green in enumerate(_CUBE_LEVELS):
+            for b, blue in enumerate(_CUBE_LEVELS):
+                lookup[(red << 16) | (green << 8) | blue] = 16 + 36 * r + 6 * g + b
+    colors = np.array(sorted(lookup), dtype=np.uint32)
+    indices = np.array([lookup[color] for color in colors.tolist()], dtype=np.uint8)
+    return colors, indices
+
+
+_PALETTE_COLORS, _PALETTE_INDICES = _palette_table()
+
+
+def _palette_rgb(depth):
+    """Get the RGB values of the palette entries frames are quantized to
+
+    The 256-color tier only uses the cube and grayscale ramp (16-255),
+    whose values are fixed; the first 16 are left to the terminal theme.
+    """
+    if depth == "16":
+        return np.array(_ANSI16, dtype=np.int32)
+    levels = np.array(_CUBE_LEVELS, dtype=np.int32)
+    cube = np.stack(np.meshgrid(levels, levels, levels, indexing='ij'), axis=-1).reshape(-1, 3)
+    gray = np.repeat(np.arange(8, 248, 10, dtype=np.int32)[:, np.newaxis], 3, axis=1)
+    return np.concatenate([np.zeros((16, 3), dtype=np.int32), cube, gray])
+
+
+_QUANTIZE_TABLES = {}
+
+
+def quantize_table(depth):
+    """Get the lookup table from truncated RGB to the nearest palette index
+
+    Built once per depth by brute-force nearest-color search over every
+    cell of a 2**(3 * _LUT_BITS) RGB grid.
+    """
+    table = _QUANTIZE_TABLES.get(depth)
+    if table is not None:
+        return table
+
+    palette = _palette_rgb(depth).astype(np.float32)
+    first = 0 if depth == "16" else 16
+    candidates = palette[first:]
+
+    steps = 1 << _LUT_BITS
+    shift = 8 - _LUT_BITS
+    centers = (np.arange(steps, dtype=np.float32) * (1 << shift)) + ((1 << shift) - 1) / 2
+    grid = np.stack(np.meshgrid(centers, centers, centers, indexing='ij'), axis=-1).reshape(-1, 3)
+
+    # Squared distances as |c|^2 - 2 c.p (the |p|^2 term is per candidate)
+    table = np.empty(len(grid), dtype=np.uint8)
+    norms = (candidates ** 2).sum(axis=1)
+    for start in range(0, len(grid), 4096):
+        chunk = grid[start:start + 4096]
+        distances = norms - 2 * chunk @ candidates.T
+        table[start:start + 4096] = distances.argmin(axis=1) + first
+
+    _QUANTIZE_TABLES[depth] = table
+    return table
+
+
+def quantize(rgb, depth):
+    """Map an (..., 3) uint8 array to palette indices for a 256 or 16 color depth"""
+    shift = 8 - _LUT_BITS
+    r, g, b = (rgb[..., channel] >> shift for channel in range(3))
+    key = (r.astype(np.intp) << (2 * _LUT_BITS)) | (g.astype(np.intp) << _LUT_BITS) | b
+    return quantize_table(depth)[key]
+
+
+def _indexed_bodies():
+    """Pre-build the foreground and background SGR parameters per palette index"""
+    fg = {"256": [f"38;5;{index}" for index in range(256)]}
+    bg = {"256": [f"48;5;{index}" for index in range(256)]}
+    fg["16"] = [f"3{index}" for index in range(8)] + [f"9{index}" for index in range(8)]
+    bg["16"] = [f"4{index}" for index in range(8)] + [f"10{index}" for index in range(8)]
+    return fg, bg
+
+
+_FG_BODIES, _BG_BODIES = _indexed_bodies()
+
+
+def pack_rgb(rgb):
+    """Pack an (..., 3) uint8 array into 24-bit integer colors"""
+    rgb = rgb.astype(np.uint32)
+    return (rgb[..., 0] << 16) | (rgb[..., 1] << 8) | rgb[..., 2]
+
+
+def unique_colors(packed):
+    """Return the sorted distinct colors and each cell's index into them"""
+    # Sorting each color with its position beats an argsort
+    flat = packed.ravel()
+    keys = (flat.astype(np.uint64) << np.uint64(32)) | np.arange(len(flat), dtype=np.uint64)
+    keys.sort()
+    ordered = (keys >> np.uint64(32)).astype(np.uint32)
+    order = (keys & np.uint64(0xFFFFFFFF)).astype(np.intp)
+    keep = np.empty(ordered.shape, dtype=bool)
+    keep[:1] = True
+    np.not_equal(ordered[1:], ordered[:-1], out=keep[1:])
+    # Each cell's index is the number of distinct colors sorted before it
+    inverse = np.empty(flat.shape, dtype=np.intp)
+    inverse[order] = np.cumsum(keep) - 1
+    return ordered[keep], inverse.reshape(packed.shape)
+
+
+def _padded(strings):
+    """Lay strings out as the rows of a byte matrix, padded with NULs"""
+    data = [string.encode() for string in strings]
+    lengths = np.array([len(item) for item in data], dtype=np.intp)
+    mask = np.arange(lengths.max(initial=0)) < lengths[:, np.newaxis]
+    cells = np.zeros(mask.shape, dtype=np.uint8)
+    cells[mask] = np.frombuffer(b"".join(data), dtype=np.uint8)
+    return cells
+
+
+def _pieces(cells):
+    """View the rows of a NUL-padded byte matrix as pieces, plus an empty last one"""
+    count, width = cells.shape
+    table = np.zeros((count + 1, max(width, 1)), dtype=np.uint8)
+    table[:count, :width] = cells
+    return table.view(f"V{table.shape[1]}").ravel()
+
+
+def _prefixed(prefix, cells):
+    """Put the same bytes before every row of a byte matrix"""
+    prefix = np.frombuffer(prefix, dtype=np.uint8)
+    return np.concatenate([np.broadcast_to(prefix, (len(cells), len(prefix))), cells], axis=1)
+
+
+def color_bodies(colors):
+    """Build the shortest foreground SGR parameters for every packed color
+
+    Colors that sit exactly on the xterm-256 cube or grayscale ramp use the
+    indexed ``38;5;n`` form; everything else falls back to ``38;2;r;g;b``.
+    Returns them as the rows of a NUL-padded byte matrix, so large color
+    sets are formatted without a Python-level loop.
+    """
+    colors = np.asarray(colors, dtype=np.uint32)
+
+    slot = np.searchsorted(_PALETTE_COLORS, colors).clip(max=len(_PALETTE_COLORS) - 1)
+    indexed = _PALETTE_COLORS[slot] == colors
+    palette_index = _PALETTE_INDICES[slot[indexed]].astype(np.intp)
+
+    # Widest form: "38;2" + ";rrr" + ";ggg" + ";bbb", built a word at a time
+    words = np.empty((len(colors), 4), dtype=np.uint32)
+    words[:, 0] = np.frombuffer(b"38;2", dtype=np.uint32)[0]
+    for column, shift in ((1, 16), (2, 8), (3, 0)):
+        words[:, column] = _DIGIT_WORDS[((colors >> shift) & 0xFF).astype(np.intp)]
+
+    # Indexed form reuses the same row: "38;5" + ";nnn"
+    words[indexed, 0] = np.frombuffer(b"38;5", dtype=np.uint32)[0]
+    words[indexed, 1] = _DIGIT_WORDS[palette_index]
+    words[indexed, 2:] = 0
+
+    return words.view(np.uint8)
+
+
+# Cells encoded in one pass, bounding the per-cell byte matrix
+_BATCH_CELLS = 1 << 16
+
+# Unchanged gaps up to this many cells are repainted rather than skipped
+_DELTA_GAP = 4
+
+
+class FrameEncoder:
+    """Encodes cell grids of color indices against one shared color table
+
+    The escapes and glyphs a cell can start with are kept as tables of
+    NUL-padded byte rows. A frame is laid out as one padded row of bytes
+    per cell, gathered from those tables, and squeezed to its output with
+    a single tobytes() and NUL deletion, so no Python-level work is done
+    per cell or run. NUL never appears in the output itself.
+    """
+
+    def __init__(self, colors, mode="block", width=0, depth="truecolor"):
+        self.colors = np.asarray(colors, dtype=np.uint32)
+        self.mode = mode
+        self.width = width
+        self.depth = depth
+
+        # Truecolor colors are packed RGB; other depths use palette indices
+        if depth == "truecolor":
+            fg = color_bodies(self.colors)
+            bg = fg.copy()
+            bg[:, 0] = ord("4")
+        else:
+            colors = self.colors.tolist()
+            fg = _padded([_FG_BODIES[depth][color] for color in colors])
+            bg = _padded([_BG_BODIES[depth][color] for color in colors])
+
+        # Piece tables, each ending in an empty piece: fg escape opens; bg
+        # escape opens then continuations of an fg escape; "m" and the
+        # glyph, then the glyph alone
+        self._fg = _pieces(_prefixed(b"\033[", fg))
+        self._bg = None
+        if mode == "half":
+            bg_open = _prefixed(b"\033[", bg)
+            bg_continue = bg_open.copy()
+            bg_continue[:, 0], bg_continue[:, 1] = 0, ord(";")
+            self._bg = _pieces(np.concatenate([bg_open, bg_continue]))
+        self._glyph = _pieces(_padded(["m" + GLYPHS[mode], GLYPHS[mode]]))
+
+    def memory_bytes(self):
+        """Bytes held by the color table and the escape pieces"""
+        tables = [self.colors, self._fg, self._glyph] + ([self._bg] if self._bg is not None else [])
+        return sum(table.nbytes for table in tables)
+
+    @classmethod
+    def from_stack(cls, stack, mode="block", depth="truecolor"):
+        """Build an encoder for an (N, H, W, 3) RGB stack and its cell grids
+
+        Returns the encoder plus the foreground and background color index
+        grids of every frame; the background grids are None in block mode.
+        """
+        count, height, width = stack.shape[:3]
+        if depth == "truecolor":
+            colors, inverse = unique_colors(pack_rgb(stack))
+        else:
+            # At most 256 palette indices, so a bincount beats sorting
+            indices = quantize(stack, depth)
+            colors = np.flatnonzero(np.bincount(indices.ravel(), minlength=256))
+            remap = np.zeros(256, dtype=np.intp)
+            remap[colors] = np.arange(len(colors))
+            inverse = remap[indices]
+        encoder = cls(colors, mode, width, depth)
+
+        if mode == "half":
+            if height % 2:
+                inverse = np.concatenate([inverse, inverse[:, -1:]], axis=1)
+            return encoder, inverse[:, 0::2], inverse[:, 1::2]
+        return encoder, inverse, None
+
+    def _segments(self, fg, bg, seg_starts, suffix, prefixes=None, groups=1):
+        """Encode flattened cells split into segments as strings
+
+        Each segment is written as runs of identical cells, opened by its
+        prefix string (if any) and closed by the suffix string. A run only
+        carries the color escapes for what changed since the previous run
+        of its segment. The cells are split into groups of equal size,
+        such as the frames of a stack, and a string is returned for each.
+        """
+        cells = len(fg)
+
+        # A run starts at every segment start and wherever a cell changes
+        segment_start = np.zeros(cells, dtype=bool)
+        segment_start[seg_starts] = True
+        starts = segment_start.copy()
+        starts[1:] |= fg[1:] != fg[:-1]
+        if bg is not None:
+            starts[1:] |= bg[1:] != bg[:-1]
+        flat_starts = np.flatnonzero(starts)
+        new_segment = segment_start[flat_starts]
+
+        run_fg = fg[flat_starts]
+        fg_changed = new_segment.copy()
+        fg_changed[1:] |= run_fg[1:] != run_fg[:-1]
+        opened = fg_changed
+        if bg is not None:
+            run_bg = bg[flat_starts]
+            bg_changed = new_segment.copy()
+            bg_changed[1:] |= run_bg[1:] != run_bg[:-1]
+            opened = fg_changed | bg_changed
+
+        # Each cell is one row of pieces: a prefix, the fg escape, the bg
+        # escape, "m" and the glyph (or just the glyph), and a suffix
+        palette = len(self.colors)
+        slots = []
+        if prefixes is not None:
+            piece = np.full(cells, len(prefixes), dtype=np.intp)
+            piece[seg_starts] = np.arange(len(prefixes))
+            slots.append((_pieces(_padded(prefixes)), piece))
+        piece = np.full(cells, palette, dtype=np.intp)
+        piece[flat_starts[fg_changed]] = run_fg[fg_changed]
+        slots.append((self._fg, piece))
+        if bg is not None:
+            # The background opens its own escape, or continues the fg one
+            piece = np.full(cells, 2 * palette, dtype=np.intp)
+            piece[flat_starts[bg_changed]] = run_bg[bg_changed] + palette * fg_changed[bg_changed]
+            slots.append((self._bg, piece))
+        piece = np.ones(cells, dtype=np.intp)
+        piece[flat_starts[opened]] = 0
+        slots.append((self._glyph, piece))
+        piece = np.ones(cells, dtype=np.intp)
+        piece[np.append(seg_starts[1:], cells) - 1] = 0
+        slots.append((_pieces(_padded([suffix])), piece))
+
+        row = np.empty(cells, dtype=[(f"f{slot}", table.dtype) for slot, (table, _) in enumerate(slots)])
+        for slot, (table, piece) in enumerate(slots):
+            row[f"f{slot}"] = table.take(piece)
+        return [group.tobytes().translate(None, b"\0").decode("utf-8")
+                for group in row.reshape(groups, -1)]
+
+    def encode(self, fg, bg=None):
+        """Encode one frame's (rows, width) cell grid as run-merged block characters"""
+        return self.encode_stack(fg[np.newaxis], None if bg is None else bg[np.newaxis])[0]
+
+    def encode_stack(self, top, bottom=None):
+        """Encode every frame of (N, rows, width) cell grids, many frames per pass"""
+        count, rows, width = top.shape
+        if rows == 0 or width == 0:
+            return [""] * count
+        batch = max(1, _BATCH_CELLS // (rows * width))
+        frames = []
+        for start in range(0, count, batch):
+            fg = top[start:start + batch]
+            texts = self._segments(
+                fg.ravel(),
+                None if bottom is None else bottom[start:start + batch].ravel(),
+                np.arange(len(fg) * rows) * width,
+                RESET + "\n",
+                groups=len(fg)
+            )
+            frames.extend(text[:-1] for text in texts)
+        return frames
+
+    def delta(self, prev_fg, prev_bg, fg, bg=None, max_changed=0.5):
+        """Encode only the cells that changed since the previous frame
+
+        Returns a Delta, or None when so much changed that a full repaint
+        is cheaper.
+        """
+        rows, width = fg.shape
+        changed = prev_fg != fg
+        if bg is not None:
+            changed |= prev_bg != bg
+
+        total = int(changed.sum())
+        if total > max_changed * changed.size:
+            return None
+        if total == 0:
+            return Delta("", 0, 0)
+
+        # Repaint short unchanged gaps between changes instead of skipping them
+        columns = np.arange(width)
+        left = np.maximum.accumulate(np.where(changed, columns, -1), axis=1)
+        right = np.minimum.accumulate(np.where(changed, columns, width)[:, ::-1], axis=1)[:, ::-1]
+        changed |= (left >= 0) & (right < width) & (right - left - 1 <= _DELTA_GAP)
+
+        span_start = changed.copy()
+        span_start[:, 1:] &= ~changed[:, :-1]
+        mask = changed.ravel()
+        positions = np.flatnonzero(span_start.ravel())
+        seg_starts = np.flatnonzero(span_start.ravel()[mask])
+        lengths = np.diff(np.append(seg_starts, int(mask.sum())))
+
+        # Relative cursor moves from the end of one span to the next
+        moves = []
+        row = col = 0
+        for position, length in zip(positions.tolist(), lengths.tolist()):
+            span_row, span_col = divmod(position, width)
+            move = f"\033[{span_row - row}B" if span_row > row else ""
+            if span_col > col:
+                move += f"\033[{span_col - col}C"
+            elif span_col < col:
+                move += f"\033[{col - span_col}D"
+            moves.append(move)
+            row, col = span_row, span_col + length
+
+        text = self._segments(
+            fg.ravel()[mask],
+            None if bg is None else bg.ravel()[mask],
+            seg_starts,
+            RESET,
+            moves
+        )[0]
+        return Delta(text, row, col)
+
+
+def encode_frames(stack, mode="block", depth="truecolor"):
+    """Encode an (N, H, W, 3) RGB frame stack as run-merged block characters
+
+    In ``block`` mode every pixel is one full block. In ``half`` mode each
+    cell is an upper half block showing two pixel rows, the top one in the
+    foreground color and the bottom one in the background color.
+
+    Each row is split into runs of identical cells; a run only carries the
+    color escapes for what changed since the previous run, and colors are
+    reset once at the end of the row. Escapes are gathered from padded byte
+    tables into one row per cell, so each frame is a single ``tobytes()``.
+
+    At the ``256`` and ``16`` color depths, pixels are first quantized to
+    the terminal palette and written with indexed escapes.
+    """
+    count, height, width = stack.shape[:3]
+    if height == 0 or width == 0:
+        return [""] * count
+
+    encoder, top, bottom = FrameEncoder.from_stack(stack, mode, depth)
+    return encoder.encode_stack(top, bottom)
+
+
+def _frame_and_delta(encoder, top, bottom, prev, frame, max_changed, text=None):
+    """Encode one frame of a cell-grid stack (unless given) along with its delta from prev"""
+    bg = None if bottom is None else bottom[frame]
+    prev_bg = None if bottom is None else bottom[prev]
+    if text is None:
+        text = encoder.encode(top[frame], bg)
+    delta = encoder.delta(top[prev], prev_bg, top[frame], bg, max_changed)
+    if delta is not None and len(delta.text) >= len(text):
+        delta = None
+    return text, delta
+
+
+def encode_deltas(stack, mode="block", max_changed=0.5, depth="truecolor"):
+    """Encode an (N, H, W, 3) RGB frame stack as full frames plus looping deltas
+
+    The delta for frame i repaints only what changed since frame i - 1;
+    frame 0's delta starts from the last frame so playback can loop. A
+    delta is None where a full repaint is cheaper.
+    """
+    count, height, width = stack.shape[:3]
+    if height == 0 or width == 0:
+        return [""] * count, [None] * count
+
+    encoder, top, bottom = FrameEncoder.from_stack(stack, mode, depth)
+    texts = encoder.encode_stack(top, bottom)
+    encoded = [
+        _frame_and_delta(encoder, top, bottom, frame - 1, frame, max_changed, texts[frame])
+        for frame in range(count)
+    ]
+    return [text for text, _ in encoded], [delta for _, delta in encoded]
+
+
+class IndexedFrames:
+    """Read-only sequence of frames kept as palette indices, encoded on demand
+
+    Every frame is a grid of indices into one shared color table, stored
+    in the smallest unsigned type that holds them (uint8 for at most 256
+    colors). Only the most recently used frames (and their deltas) are
+    held as encoded strings.
+    """
+
+    def __init__(self, encoder, top, bottom=None, lru=8, max_changed=0.5):
+        self.encoder = encoder
+        # Resampled truecolor frames can have well over 65536 colors
+        dtype = np.min_scalar_type(max(0, len(encoder.colors) - 1))
+        self.top = top.astype(dtype)
+        self.bottom = None if bottom is None else bottom.astype(dtype)
+        self.lru = max(1, lru)
+        self.max_changed = max_changed
+        self._encoded = OrderedDict()
+
+    @classmethod
+    def from_stack(cls, stack, mode="block", depth="truecolor", lru=8):
+        """Index an (N, H, W, 3) RGB frame stack against one shared palette"""
+        encoder, top, bottom = FrameEncoder.from_stack(stack, mode, depth)
+        return cls(encoder, top, bottom, lru)
+
+    def __len__(self):
+        return len(self.top)
+
+    def _encode(self, index):
+        """Get a frame's text and delta, encoding them if not recently used"""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("frame index out of range")
+
+        entry = self._encoded.get(index)
+        if entry is not None:
+            self._encoded.move_to_end(index)
+            return entry
+
+        rows, width = self.top.shape[1:]
+        if rows == 0 or width == 0:
+            entry = ("", None)
+        else:
+            entry = _frame_and_delta(
+                self.encoder, self.top, self.bottom, index - 1, index, self.max_changed
+            )
+        self._encoded[index] = entry
+        while len(self._encoded) > self.lru:
+            self._encoded.popitem(last=False)
+        return entry
+
+    def __getitem__(self, index):
+        return self._encode(index)[0]
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def delta(self, index):
+        """Get the delta from the previous frame, or None for a full repaint"""
+        return self._encode(index)[1]
+
+    def memory_bytes(self):
+        """Bytes held by the index grids, shared palette and encoded frames"""
+        total = self.top.nbytes + (0 if self.bottom is None else self.bottom.nbytes)
+        total += self.encoder.memory_bytes()
+        for text, delta in self._encoded.values():
+            total += sys.getsizeof(text)
+            if delta is not None:
+                total += sys.getsizeof(delta.text)
+        return total
+
+
+def encode_transition(prev_rgb, rgb, mode="block", max_changed=0.5, depth="truecolor"):
+    """Encode one (H, W, 3) RGB frame plus its delta from the frame before it"""
+    if rgb.shape[0] == 0 or rgb.shape[1] == 0:
+        return "", None
+    encoder, top, bottom = FrameEncoder.from_stack(np.stack([prev_rgb, rgb]), mode, depth)
+    return _frame_and_delta(encoder, top, bottom, 0, 1, max_changed)
+
+
+def encode_rgb(rgb, mode="block", depth="truecolor"):
+    """Encode a single (H, W, 3) RGB array as run-merged block characters"""
+    return encode_frames(rgb[np.newaxis], mode, depth)[0]
+
+
+def cell_bytes(stack, mode="block"):
+    """Return each frame's size in bytes in the naive one-escape-per-cell form"""
+    count, height, width = stack.shape[:3]
+    digits = _DIGIT_COUNT[stack].sum(axis=(1, 2, 3))
+    if mode == "half":
+        rows = (height + 1) // 2
+        if height % 2:
+            digits = digits + _DIGIT_COUNT[stack[:, -1]].sum(axis=(1, 2))
+        overhead = _HALF_CELL_OVERHEAD
+    else:
+        rows = height
+        overhead = _CELL_OVERHEAD
+    return (digits + rows * width * overhead + max(rows - 1, 0)).tolist()
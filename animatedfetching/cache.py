@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+On-disk cache module for AnimatedFetching
+"""
+
+import os
+import mmap
+import struct
+import hashlib
+from pathlib import Path
+
+from .terminal import Delta
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME', os.path.expanduser("~/.cache")),
+    "animatedfetching"
+)
+
+
+def atomic_write(path, data):
+    """Write bytes to path so readers only ever see a complete file"""
+    import tempfile
+
+    directory = os.path.dirname(path)
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class CachedFrames:
+    """Read-only sequence of encoded frames backed by a memory-mapped cache file"""
+
+    def __init__(self, buffer, offsets):
+        self._buffer = buffer
+        self._offsets = offsets
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("frame index out of range")
+        start, end = self._offsets[index], self._offsets[index + 1]
+        return self._buffer[start:end].decode('utf-8')
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def memory_bytes(self):
+        """Mapped bytes spanned by these frames"""
+        return self._offsets[-1] - self._offsets[0] + 8 * len(self._offsets)
+
+
+class CachedDeltas:
+    """Read-only sequence of frame deltas backed by a memory-mapped cache file"""
+
+    def __init__(self, texts, positions):
+        self._texts = texts
+        self._positions = positions
+
+    def __len__(self):
+        return len(self._texts)
+
+    def __getitem__(self, index):
+        row, col = self._positions[index]
+        if row < 0:
+            return None
+        return Delta(self._texts[index], row, col)
+
+    def memory_bytes(self):
+        """Mapped bytes spanned by these deltas"""
+        return self._texts.memory_bytes() + 8 * len(self._positions)
+
+
+class FrameCache:
+    """Stores pre-rendered animation frames keyed by their source and settings
+
+    File layout (little endian):
+        header   magic, format version, frame count, play count (0 for forever)
+        float64  frame durations        (count)
+        uint64   per-cell frame sizes   (count)
+        int32    delta end row, col     (count x 2, row -1 for no delta)
+        uint64   payload offsets        (2 * count + 1, relative to file start)
+        bytes    UTF-8 encoded frames, then UTF-8 encoded deltas
+    """
+
+    MAGIC = b"AFFC"
+    FORMAT_VERSION = 4
+    HEADER = struct.Struct("<4sHII")
+    SUFFIX = ".frames"
+
+    def __init__(self, cache_dir=None, max_bytes=64 * 1024 * 1024):
+        self.cache_dir = os.path.expanduser(cache_dir or DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes
+
+    def key(self, gif_path, width, mode, color_depth="truecolor", decode=()):
+        """Build the cache key for a GIF rendered with the given settings
+
+        decode holds any other settings that change the decoded frames.
+        """
+        from . import __version__
+
+        gif_path = os.path.realpath(os.path.expanduser(gif_path))
+        stat = os.stat(gif_path)
+        parts = [gif_path, stat.st_mtime_ns, stat.st_size, width, mode, color_depth, __version__, *decode]
+        return hashlib.sha1("\0".join(map(str, parts)).encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + self.SUFFIX)
+
+    def load(self, key):
+        """Load cached (frames, durations, raw_frame_bytes, deltas, plays), or None on a miss"""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            magic, version, count, plays = self.HEADER.unpack_from(buffer, 0)
+            if magic != self.MAGIC or version != self.FORMAT_VERSION:
+                raise ValueError("unrecognized cache file")
+
+            pos = self.HEADER.size
+            durations = struct.unpack_from(f"<{count}d", buffer, pos)
+            pos += 8 * count
+            raw_bytes = struct.unpack_from(f"<{count}Q", buffer, pos)
+            pos += 8 * count
+            positions = struct.unpack_from(f"<{2 * count}i", buffer, pos)
+            positions = list(zip(positions[0::2], positions[1::2]))
+            pos += 8 * count
+            offsets = struct.unpack_from(f"<{2 * count + 1}Q", buffer, pos)
+            if offsets[-1] != len(buffer):
+                raise ValueError("truncated cache file")
+        except (struct.error, ValueError):
+            buffer.close()
+            self._remove(path)
+            return None
+
+        # Mark as recently used for eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        frames = CachedFrames(buffer, offsets[:count + 1])
+        deltas = CachedDeltas(CachedFrames(buffer, offsets[count:]), positions)
+        return frames, list(durations), list(raw_bytes), deltas, plays or None
+
+    def store(self, key, frames, durations, raw_frame_bytes, deltas=None, plays=1):
+        """Write frames to the cache atomically, then enforce the size cap"""
+        count = len(frames)
+        deltas = [None] * count if deltas is None else deltas
+        payload = [frame.encode('utf-8') for frame in frames]
+        payload += [b"" if delta is None else delta.text.encode('utf-8') for delta in deltas]
+        positions = [(-1, -1) if delta is None else (delta.row, delta.col) for delta in deltas]
+
+        offsets = [self.HEADER.size + 8 * count * 3 + 8 * (2 * count + 1)]
+        for data in payload:
+            offsets.append(offsets[-1] + len(data))
+
+        data = b"".join([
+            self.HEADER.pack(self.MAGIC, self.FORMAT_VERSION, count, plays or 0),
+            struct.pack(f"<{count}d", *durations),
+            struct.pack(f"<{count}Q", *raw_frame_bytes),
+            struct.pack(f"<{2 * count}i", *(value for position in positions for value in position)),
+            struct.pack(f"<{2 * count + 1}Q", *offsets),
+        ] + payload)
+
+        try:
+            atomic_write(self._path(key), data)
+            self._evict()
+        except OSError:
+            pass
+
+    def _entries(self):
+        """List cache files as (mtime, size, path), least recently used first"""
+        entries = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return entries
+
+        for name in names:
+            if not name.endswith(self.SUFFIX):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return sorted(entries)
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits its size cap"""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+    def clear(self):
+        """Remove every cached entry and return how many were removed"""
+        entries = self._entries()
+        for _, _, path in entries:
+            self._remove(path)
+        return len(entries)
+
+
+class InfoCache:
+    """Stores system info values between runs, each kept per its field's policy
+
+    A policy is "boot" (valid until the next reboot), "live" (always
+    collected again) or a number of seconds the value stays fresh. Values
+    that are not fresh are still returned as stale, for use as fallbacks
+    when their collector fails. The file is
+    replaced atomically, so shells starting at once never read a partial
+    file; when two of them write, the last one wins, and any field it
+    lost is simply collected again on a later run.
+    """
+
+    FORMAT_VERSION = 1
+    FILENAME = "sysinfo.json"
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = os.path.expanduser(cache_dir or DEFAULT_CACHE_DIR)
+        self.path = os.path.join(self.cache_dir, self.FILENAME)
+
+    def _read(self, boot_id):
+        """Read the stored fields, or nothing if they are from another boot"""
+        import json
+
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get('version') != self.FORMAT_VERSION:
+            return {}
+        if data.get('boot') != boot_id or not isinstance(data.get('fields'), dict):
+            return {}
+        return data['fields']
+
+    def load(self, boot_id, policies, now=None):
+        """Split stored values into (fresh, stale) dicts under the given policies"""
+        import time
+
+        now = time.time() if now is None else now
+        fresh, stale = {}, {}
+        for key, entry in self._read(boot_id).items():
+            try:
+                value, stored_at = entry['value'], float(entry['time'])
+            except (TypeError, KeyError, ValueError):
+                continue
+            policy = policies.get(key, "live")
+            if policy == "boot" or (not isinstance(policy, str) and 0 <= now - stored_at < policy):
+                fresh[key] = value
+            else:
+                stale[key] = value
+        return fresh, stale
+
+    def store(self, boot_id, values, now=None):
+        """Merge freshly collected values into the cache file"""
+        import json
+        import time
+
+        now = time.time() if now is None else now
+        fields = self._read(boot_id)
+        for key, value in values.items():
+            fields[key] = {'value': value, 'time': now}
+        data = {'version': self.FORMAT_VERSION, 'boot': boot_id, 'fields': fields}
+        try:
+            atomic_write(self.path, json.dumps(data).encode('utf-8'))
+        except OSError:
+            pass
+
+    def clear(self):
+        """Remove the cache file and return whether there was one"""
+        try:
+            os.unlink(self.path)
+            return True
+        except OSError:
+            return False
@@ -4,10 +4,13 @@ Configuration module for AnimatedFetching
 """
 
 import os
+import copy
 import json
 import shutil
+import hashlib
 from pathlib import Path
-from jsoncomment import JsonComment
+
+from .cache import DEFAULT_CACHE_DIR, atomic_write
 
 class Config:
     """Handles configuration loading from JSONC files"""
@@ -19,7 +22,18 @@ class Config:
             "enabled": True,
             "path": "~/.config/animatedfetching/animation.gif",
             "width": 40,
-            "fps": 10
+            "fps": 10,
+            "duration": 5,
+            "output": "direct",
+            "mode": "block",
+            "color_depth": "auto",
+            "lru": 8,
+            "streaming": False,
+            "window": 32,
+            "resample": "bicubic",
+            "max_source_pixels": 1000000,
+            "max_frames": 300,
+            "max_decode_mb": 64
         },
         "info_sections": [
             {"label": "OS", "key": "os", "color": "cyan"},
@@ -36,13 +50,15 @@ class Config:
                 "label": "System Update",
                 "command": "sudo apt update && sudo apt upgrade",
                 "key": "u",
-                "color": "green"
+                "color": "green",
+                "interactive": True
             },
             {
                 "label": "Neofetch",
                 "command": "neofetch",
                 "key": "n",
-                "color": "cyan"
+                "color": "cyan",
+                "interactive": True
             },
             {
                 "label": "Disk Usage",
@@ -54,7 +70,8 @@ class Config:
                 "label": "Top Processes",
                 "command": "top",
                 "key": "t",
-                "color": "red"
+                "color": "red",
+                "interactive": True
             }
         ],
         "layout": {
@@ -67,30 +84,128 @@ class Config:
             "title": "bold cyan",
             "label": "bold",
             "separator": "dim"
+        },
+        "cache": {
+            "enabled": True,
+            "max_size_mb": 64,
+            "sysinfo": True
+        },
+        "sysinfo": {
+            "timeouts": {},
+            "policies": {},
+            "refresh": {}
+        },
+        "jobs": {
+            "timeout": 300,
+            "pane_height": 6,
+            "max_lines": 1000
+        },
+        "snapshot": {
+            "enabled": False,
+            "max_age": 3600
         }
     }
     
+    # Bump when the compiled config file layout changes
+    COMPILED_VERSION = 1
+    
     @classmethod
-    def load(cls, config_path=None):
-        """Load configuration from file or use defaults"""
+    def load(cls, config_path=None, cache_dir=None):
+        """Load configuration from file or use defaults
+        
+        The merged config is compiled to plain JSON in the cache directory
+        and reused while the file's mtime and size are unchanged, which
+        skips the JSONC parser entirely.
+        """
         if config_path is None:
             config_path = cls.DEFAULT_CONFIG_PATH
         
         config_path = os.path.expanduser(config_path)
         
-        if os.path.exists(config_path):
-            try:
-                with open(config_path, 'r') as f:
-                    parser = JsonComment()
-                    config = parser.load(f)
-                    # Merge with defaults to ensure all keys exist
-                    return cls._merge_configs(cls.DEFAULT_CONFIG, config)
-            except Exception as e:
-                print(f"Warning: Failed to load config from {config_path}: {e}")
-                print("Using default configuration...")
-                return cls.DEFAULT_CONFIG.copy()
-        else:
-            return cls.DEFAULT_CONFIG.copy()
+        try:
+            stat = os.stat(config_path)
+        except OSError:
+            return copy.deepcopy(cls.DEFAULT_CONFIG)
+        
+        compiled_path = cls._compiled_path(config_path, cache_dir)
+        stamp = cls._stamp(config_path, stat)
+        config = cls._load_compiled(compiled_path, stamp)
+        if config is not None:
+            return config
+        
+        try:
+            with open(config_path, 'r') as f:
+                from jsoncomment import JsonComment
+                parser = JsonComment()
+                config = parser.load(f)
+            # Merge with defaults to ensure all keys exist
+            config = cls._validate(cls._merge_configs(cls.DEFAULT_CONFIG, config))
+        except Exception as e:
+            print(f"Warning: Failed to load config from {config_path}: {e}")
+            print("Using default configuration...")
+            return copy.deepcopy(cls.DEFAULT_CONFIG)
+        
+        if config.get('cache', {}).get('enabled', True):
+            cls._store_compiled(compiled_path, stamp, config)
+        return config
+    
+    @staticmethod
+    def _compiled_path(config_path, cache_dir=None):
+        cache_dir = os.path.expanduser(cache_dir or DEFAULT_CACHE_DIR)
+        key = hashlib.sha1(os.path.realpath(config_path).encode('utf-8')).hexdigest()[:16]
+        return os.path.join(cache_dir, f"config-{key}.json")
+    
+    @classmethod
+    def _stamp(cls, config_path, stat):
+        """Identify the source file and defaults a compiled config was built from"""
+        from . import __version__
+        
+        defaults = json.dumps(cls.DEFAULT_CONFIG, sort_keys=True).encode('utf-8')
+        return {
+            'version': cls.COMPILED_VERSION,
+            'package': __version__,
+            'source': os.path.realpath(config_path),
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'defaults': hashlib.sha1(defaults).hexdigest(),
+        }
+    
+    @staticmethod
+    def _load_compiled(compiled_path, stamp):
+        """Load a compiled config if it was built from the same file, or None"""
+        try:
+            with open(compiled_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get('stamp') != stamp or not isinstance(data.get('config'), dict):
+            return None
+        return data['config']
+    
+    @staticmethod
+    def clear_compiled(cache_dir=None):
+        """Remove every compiled config and return how many were removed"""
+        cache_dir = os.path.expanduser(cache_dir or DEFAULT_CACHE_DIR)
+        try:
+            names = os.listdir(cache_dir)
+        except OSError:
+            return 0
+        removed = 0
+        for name in names:
+            if name.startswith("config-") and name.endswith(".json"):
+                try:
+                    os.unlink(os.path.join(cache_dir, name))
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+    
+    @staticmethod
+    def _store_compiled(compiled_path, stamp, config):
+        try:
+            atomic_write(compiled_path, json.dumps({'stamp': stamp, 'config': config}).encode('utf-8'))
+        except (OSError, TypeError, ValueError):
+            pass
     
     @classmethod
     def create_default_config(cls, config_path=None):
@@ -131,11 +246,24 @@ class Config:
     
     @staticmethod
     def _merge_configs(default, user):
-        """Recursively merge user config with defaults"""
-        result = default.copy()
+        """Recursively merge user config with defaults
+        
+        The result shares no containers with either argument, so changing
+        it never changes the defaults.
+        """
+        result = copy.deepcopy(default)
         for key, value in user.items():
             if key in result and isinstance(result[key], dict) and isinstance(value, dict):
                 result[key] = Config._merge_configs(result[key], value)
             else:
-                result[key] = value
+                result[key] = copy.deepcopy(value)
         return result
+    
+    @classmethod
+    def _validate(cls, config):
+        """Replace top-level sections of the wrong type with their defaults"""
+        for key, default in cls.DEFAULT_CONFIG.items():
+            if isinstance(default, (dict, list)) and not isinstance(config.get(key), type(default)):
+                print(f"Warning: Config section '{key}' should be a {type(default).__name__}, using the default")
+                config[key] = copy.deepcopy(default)
+        return config
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Resident daemon for AnimatedFetching
+
+`afetch --daemon` keeps the config, encoded frames and system info
+collectors loaded and listens on a per-user Unix socket. A plain `afetch`
+connects to it, sends its terminal size and environment, and copies the
+rendered output to its terminal, so it never imports rich, NumPy or
+Pillow. When no daemon answers, the client renders in-process as usual.
+
+The client half of this module only uses the standard library so that it
+stays fast to import; its request is a few lines of plain text rather
+than JSON, since importing json (and re) costs more than the rest of the
+client.
+"""
+
+import os
+import sys
+import stat
+import socket
+import struct
+
+from . import __version__
+from .terminal import write_all
+
+# Environment the output depends on, passed from the client to the renderer
+CLIENT_ENV = ('TERM', 'COLORTERM', 'SHELL', 'TERM_PROGRAM', 'NO_COLOR', 'LANG', 'LC_ALL')
+
+
+def encode_request(width, height, tty, env):
+    """Build a client request: a version line, then one "name value" line per field"""
+    lines = [f"afetch {__version__}", f"width {width}", f"height {height}", f"tty {int(tty)}"]
+    lines += [f"env {key} {value}" for key, value in env.items() if "\n" not in value]
+    return ("\n".join(lines) + "\n\n").encode('utf-8')
+
+
+def decode_request(lines):
+    """Parse the lines of a client request, or return None if it is malformed"""
+    if not lines or lines[0] != f"afetch {__version__}":
+        return None
+    message = {'width': 80, 'height': 25, 'tty': False, 'env': {}}
+    try:
+        for line in lines[1:]:
+            name, _, value = line.partition(" ")
+            if name in ('width', 'height'):
+                message[name] = max(1, int(value))
+            elif name == 'tty':
+                message['tty'] = value == "1"
+            elif name == 'env':
+                key, _, value = value.partition(" ")
+                if key in CLIENT_ENV:
+                    message['env'][key] = value
+    except ValueError:
+        return None
+    return message
+
+
+def socket_path():
+    """Get the per-user socket path, overridable with ANIMATEDFETCHING_SOCKET
+
+    Without XDG_RUNTIME_DIR, the socket goes in a private directory under
+    the user's cache directory rather than anywhere other users can write.
+    """
+    path = os.environ.get('ANIMATEDFETCHING_SOCKET')
+    if path:
+        return path
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, "animatedfetching.sock")
+    cache_home = os.environ.get('XDG_CACHE_HOME', os.path.expanduser("~/.cache"))
+    return os.path.join(cache_home, "animatedfetching", "run", "animatedfetching.sock")
+
+
+def is_private(path, kind=stat.S_ISSOCK):
+    """Check path is of the given kind, owned by this user and closed to everyone else
+
+    Symlinks are never followed, so they never pass.
+    """
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return kind(st.st_mode) and st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+
+def peer_uid(sock):
+    """Get the uid of the process at the other end of a Unix socket, or None if unknown"""
+    if not hasattr(socket, 'SO_PEERCRED'):
+        return None
+    creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize('3i'))
+    return struct.unpack('3i', creds)[1]
+
+
+def request(path=None, out=None):
+    """Have a running daemon render the fetch to out and return True
+
+    Returns False, having written nothing, when no daemon is listening or
+    it declined the request; the caller then renders in-process.
+    """
+    path = path or socket_path()
+    out = sys.stdout if out is None else out
+    # Only talk to a socket another user can't have put there
+    if not is_private(path):
+        return False
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        uid = peer_uid(sock)
+    except OSError:
+        sock.close()
+        return False
+    if uid is not None and uid != os.getuid():
+        sock.close()
+        return False
+
+    fd = out.fileno()
+    try:
+        columns, lines = os.get_terminal_size(fd)
+    except OSError:
+        columns, lines = 80, 25
+    env = {key: os.environ[key] for key in CLIENT_ENV if key in os.environ}
+
+    received = False
+    try:
+        sock.sendall(encode_request(columns, lines, os.isatty(fd), env))
+        while True:
+            data = sock.recv(65536)
+            if not data:
+                break
+            received = True
+            write_all(fd, data)
+    except KeyboardInterrupt:
+        if received:
+            # Leave the terminal usable if interrupted mid-frame
+            write_all(fd, b"\033[?2026l\033[?25h\n")
+        raise
+    except OSError:
+        pass
+    finally:
+        sock.close()
+    return received
+
+
+def launch():
+    """Console script entry point
+
+    A plain fetch is served by a running daemon, or from a login snapshot,
+    when possible, and --format output skips rich altogether; anything
+    else runs in-process.
+    """
+    if len(sys.argv) == 1:
+        from .snapshot import show
+
+        try:
+            if request() or show():
+                return
+        except KeyboardInterrupt:
+            sys.exit(1)
+    elif any(arg.partition("=")[0] == '--format' for arg in sys.argv[1:]):
+        from . import formats
+
+        try:
+            if formats.main():
+                return
+        except KeyboardInterrupt:
+            sys.exit(1)
+
+    from .main import main
+    main()
+
+
+class Daemon:
+    """Serves fetch output from a process that keeps everything loaded
+
+    Each client is served by a forked child, so rendering state is never
+    shared and a slow or interrupted client can't hold up the others.
+    The config file and GIF are checked on every request and reloaded
+    when they change.
+    """
+
+    # Seconds a client gets to send its request
+    REQUEST_TIMEOUT = 2.0
+
+    def __init__(self, config_path=None, path=None):
+        self.config_path = config_path
+        self.path = path or socket_path()
+        self.app = None
+        self._sources = None
+        self._server = None
+        self._stopping = False
+
+    def _source_stamps(self):
+        """Modification times of the config file and GIF the output depends on"""
+        from .config import Config
+
+        paths = [os.path.expanduser(self.config_path or Config.DEFAULT_CONFIG_PATH)]
+        if self.app is not None:
+            paths.append(os.path.expanduser(self.app.config.get('animation', {}).get('path') or ""))
+        stamps = []
+        for path in paths:
+            try:
+                stamps.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                stamps.append(None)
+        return stamps
+
+    def _load(self):
+        """Load the config, animation and sysinfo collectors"""
+        from .main import AnimatedFetching
+
+        if self.app is not None:
+            self.app.close()
+        self.app = AnimatedFetching(config_path=self.config_path)
+        if self.app.animation is not None and self.app.animation.thread is not None:
+            # Forked children can't share a producer thread
+            self.app.animation.stop()
+            self.app.animation = self.app.load_animation(streaming=False)
+        self._sources = self._source_stamps()
+        self._warm_up()
+
+    def _warm_up(self):
+        """Render the layout once before forking any children
+
+        This loads rich's lazy imports and fills its caches in the parent,
+        so no child pays for them again.
+        """
+        import io
+        import rich.live  # noqa: F401
+        from rich.console import Console
+        from rich.text import Text
+
+        for tty in (True, False):
+            console = Console(file=io.StringIO(), force_terminal=tty, width=80, height=25)
+            if self.app.animation is not None and self.app.animation.get_frame_count():
+                console.print(Text.from_ansi(self.app.animation.get_static_frame()))
+            console.print(self.app._render_footer())
+
+    def _listen(self):
+        """Bind the socket, replacing a stale one left by a daemon that died"""
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory, mode=0o700)
+        if os.path.lexists(self.path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.path)
+            except OSError:
+                os.unlink(self.path)
+            else:
+                raise RuntimeError(f"A daemon is already listening on {self.path}")
+            finally:
+                probe.close()
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        umask = os.umask(0o077)  # Only this user may connect
+        try:
+            server.bind(self.path)
+        finally:
+            os.umask(umask)
+        server.listen(16)
+        return server
+
+    def serve_forever(self, ready=None):
+        """Accept and serve clients until interrupted"""
+        self._load()
+        self._server = self._listen()
+        if ready is not None:
+            ready()
+        try:
+            while True:
+                try:
+                    conn, _ = self._server.accept()
+                except OSError:
+                    if self._stopping:
+                        break
+                    raise
+                self._reap()
+                try:
+                    self._accept(conn)
+                finally:
+                    conn.close()
+        finally:
+            self.close()
+
+    def shutdown(self):
+        """Make serve_forever return, from another thread"""
+        self._stopping = True
+        self._server.shutdown(socket.SHUT_RDWR)
+
+    def close(self):
+        """Stop listening and remove the socket"""
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+        if self.app is not None:
+            self.app.close()
+
+    @staticmethod
+    def _reap():
+        """Collect exited children"""
+        try:
+            while os.waitpid(-1, os.WNOHANG)[0]:
+                pass
+        except ChildProcessError:
+            pass
+
+    def _accept(self, conn):
+        """Read a client's request and fork a child to serve it"""
+        conn.settimeout(self.REQUEST_TIMEOUT)
+        lines = []
+        try:
+            with conn.makefile('r', encoding='utf-8', errors='replace', newline="\n") as f:
+                for line in f:
+                    line = line.rstrip("\n")
+                    if not line:
+                        break
+                    lines.append(line)
+        except OSError:
+            return
+        message = decode_request(lines)
+        if message is None:
+            # Closing without output makes the client render in-process
+            return
+
+        if self._source_stamps() != self._sources:
+            self._load()
+
+        if os.fork() == 0:
+            status = 1
+            try:
+                conn.settimeout(None)
+                self._serve(conn, message)
+                status = 0
+            except BaseException:
+                pass
+            finally:
+                os._exit(status)
+
+    def _serve(self, conn, message):
+        """Child process: render the fetch for one client onto its connection"""
+        from rich.console import Console
+        from .terminal import detect_color_depth
+
+        self._server.close()
+        # Render with the client's environment alone, not what the daemon started with
+        for key in CLIENT_ENV:
+            os.environ.pop(key, None)
+        os.environ.update(message['env'])
+
+        app = self.app
+        animation_config = app.config.get('animation', {})
+        if app.animation is not None and animation_config.get('color_depth', 'auto') == 'auto':
+            if detect_color_depth() != app.animation.color_depth:
+                app.animation = app.load_animation(streaming=False)
+        app.sysinfo = app.collect_sysinfo().result()
+
+        with conn.makefile('w', encoding='utf-8') as out:
+            app.console = Console(
+                file=out,
+                force_terminal=message['tty'],
+                width=message['width'],
+                height=message['height']
+            )
+            app.run()
+            out.flush()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Machine-readable output for AnimatedFetching
+
+`afetch --format json|plain|ansi` prints just the system info the config
+shows, each value as soon as its collector finishes, for status bars and
+MOTD scripts that poll it. It skips the animation and never imports
+rich, Pillow or NumPy.
+"""
+
+import sys
+import json
+
+from .config import Config
+from .sysinfo import SystemInfo
+from .cache import InfoCache
+
+FORMATS = ('json', 'plain', 'ansi')
+
+# SGR codes for the parts of rich style strings used in configs
+_SGR = {'bold': 1, 'dim': 2, 'italic': 3, 'underline': 4, 'reverse': 7}
+_COLORS = ('black', 'red', 'green', 'yellow', 'blue', 'magenta', 'cyan', 'white')
+for _index, _color in enumerate(_COLORS):
+    _SGR[_color] = 30 + _index
+    _SGR['bright_' + _color] = 90 + _index
+del _index, _color
+
+
+def sgr(style):
+    """Translate a rich style such as "bold cyan" to an SGR escape sequence
+
+    Words without a plain SGR equivalent (hex colors, "on ..." and the
+    like) are left out.
+    """
+    codes = [str(_SGR[word]) for word in style.lower().split() if word in _SGR]
+    return f"\033[{';'.join(codes)}m" if codes else ""
+
+
+def info_keys(config):
+    """Get the info keys the layout actually shows"""
+    keys = []
+    if config.get('layout', {}).get('show_hostname', True):
+        keys.append('hostname')
+    for section in config.get('info_sections', []):
+        key = section.get('key')
+        if key and key not in keys:
+            keys.append(key)
+    return keys
+
+
+def info_cache(config):
+    """Create the system info cache if caching is enabled"""
+    cache_config = config.get('cache', {})
+    if not cache_config.get('enabled', True) or not cache_config.get('sysinfo', True):
+        return None
+    return InfoCache(cache_dir=cache_config.get('path'))
+
+
+def labels(config):
+    """Get the label and style of each info key, as the layout shows them"""
+    colors = config.get('colors', {})
+    labels = {'hostname': ("Host", colors.get('title', 'bold cyan'))}
+    for section in config.get('info_sections', []):
+        key = section.get('key')
+        if key:
+            labels[key] = (section.get('label', key), f"bold {section.get('color', 'white')}")
+    return labels
+
+
+def write(config, format, out=None):
+    """Collect the configured info and write each value to out as it arrives
+
+    json writes a single object whose members appear in the order their
+    collectors finish; plain and ansi write one "Label: value" line each.
+    """
+    out = sys.stdout if out is None else out
+    sysinfo_config = config.get('sysinfo', {})
+    collection = SystemInfo.start(
+        timeouts=sysinfo_config.get('timeouts'),
+        cache=info_cache(config),
+        policies=sysinfo_config.get('policies'),
+        keys=info_keys(config)
+    )
+    names = labels(config)
+
+    if format == 'json':
+        out.write("{")
+    separator = "\n  "
+    for key, value in collection.as_completed():
+        if format == 'json':
+            out.write(f"{separator}{json.dumps(key)}: {json.dumps(value, default=str)}")
+            separator = ",\n  "
+        else:
+            label, style = names.get(key, (key, ""))
+            if format == 'ansi' and sgr(style):
+                label = f"{sgr(style)}{label}\033[m"
+            out.write(f"{label}: {value}\n")
+        out.flush()
+    if format == 'json':
+        out.write("\n}\n" if separator != "\n  " else "}\n")
+    out.flush()
+
+
+def parse_args(args):
+    """Get (format, config path) from --format and -c/--config alone, or None
+
+    Anything else, including an unknown format, is left to the full
+    argument parser in main, which reports it properly.
+    """
+    format = config_path = None
+    args = list(args)
+    while args:
+        arg = args.pop(0)
+        name, equals, value = arg.partition("=")
+        if name not in ('--format', '-c', '--config'):
+            return None
+        if not equals:
+            if not args:
+                return None
+            value = args.pop(0)
+        if name == '--format':
+            format = value
+        else:
+            config_path = value
+    if format not in FORMATS:
+        return None
+    return format, config_path
+
+
+def main(args=None):
+    """Print the fetch in a machine-readable format and return True
+
+    Returns False, having printed nothing, when the arguments are for the
+    full command line instead.
+    """
+    parsed = parse_args(sys.argv[1:] if args is None else args)
+    if parsed is None:
+        return False
+    format, config_path = parsed
+    # Without a config file this uses the defaults, rather than creating one
+    write(Config.load(config_path), format)
+    return True
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Background command runner for AnimatedFetching buttons
+"""
+
+import os
+import time
+import signal
+import subprocess
+from collections import deque
+from threading import Thread, Lock
+
+
+class Job:
+    """A shell command running in the background with its output collected
+
+    stdout and stderr are merged and read line by line by a daemon
+    thread, keeping the last max_lines lines. The command runs in its own
+    process group so cancelling it also stops anything it started.
+    """
+
+    # Seconds a cancelled command gets to exit before it is killed
+    GRACE = 2.0
+
+    def __init__(self, label, command, timeout=None, max_lines=1000, clock=time.monotonic):
+        self.label = label
+        self.command = command
+        self.timeout = timeout  # Seconds, None for no limit
+        self.clock = clock
+        self.lines = deque(maxlen=max_lines)
+        self.status = "running"  # Then "done", "failed", "timed out" or "cancelled"
+        self.returncode = None
+        self.started = clock()
+        self.finished = None
+        self._lock = Lock()
+        self._kill_at = None
+        self._stopping = None
+        self._changed = True
+        try:
+            self._process = subprocess.Popen(
+                command, shell=True, stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+        except OSError as e:
+            self._process = None
+            self.lines.append(str(e))
+            self._finish("failed", None)
+            return
+        Thread(target=self._read, daemon=True).start()
+
+    def _read(self):
+        """Reader thread: collect output lines until the command closes it"""
+        for line in self._process.stdout:
+            text = line.decode('utf-8', 'replace').rstrip("\r\n")
+            with self._lock:
+                self.lines.append(text)
+                self._changed = True
+        self._process.stdout.close()
+
+    def _finish(self, status, returncode):
+        self.status = status
+        self.returncode = returncode
+        self.finished = self.clock()
+        self._changed = True
+
+    @property
+    def running(self):
+        return self.finished is None
+
+    def elapsed(self):
+        """Seconds the command has been running, or ran for"""
+        return (self.finished if self.finished is not None else self.clock()) - self.started
+
+    def _signal(self, sig):
+        try:
+            os.killpg(self._process.pid, sig)
+        except OSError:
+            pass
+
+    def cancel(self, status="cancelled"):
+        """Ask the command to stop, killing it if it hasn't after GRACE seconds"""
+        if not self.running or self._stopping is not None:
+            return
+        self._stopping = status
+        self._kill_at = self.clock() + self.GRACE
+        self._signal(signal.SIGTERM)
+
+    def poll(self):
+        """Check on the command and return whether it changed since the last poll
+        
+        Also enforces the timeout and kills a cancelled command that
+        outlived its grace period.
+        """
+        if self.running:
+            returncode = self._process.poll()
+            if returncode is not None:
+                self._finish(self._stopping or ("done" if returncode == 0 else "failed"), returncode)
+            elif self._kill_at is not None and self.clock() >= self._kill_at:
+                self._signal(signal.SIGKILL)
+                self._kill_at = None
+            elif self.timeout is not None and self.clock() - self.started >= self.timeout:
+                self.cancel("timed out")
+
+        with self._lock:
+            changed, self._changed = self._changed, False
+        return changed
+
+    def snapshot(self):
+        """Get a copy of the output lines collected so far"""
+        with self._lock:
+            return list(self.lines)
+
+
+class JobRunner:
+    """Runs button commands in the background, any number at a time
+
+    The most recently started job is the one shown in the output pane,
+    which can be scrolled back through its output.
+    """
+
+    def __init__(self, timeout=None, max_lines=1000, history=5):
+        self.timeout = timeout  # Default for commands without their own
+        self.max_lines = max_lines
+        self.history = history  # Jobs kept around, unless still running
+        self.jobs = []
+        self.scroll = 0  # Lines scrolled back from the end of the output
+        self._changed = False
+
+    def start(self, label, command, timeout=None):
+        """Start a command and show its output"""
+        timeout = self.timeout if timeout is None else timeout
+        job = Job(label, command, timeout or None, self.max_lines)
+        self.jobs.append(job)
+        # Forget the oldest finished jobs past the history size
+        finished = [other for other in self.jobs if not other.running]
+        for other in finished[:max(0, len(self.jobs) - self.history)]:
+            self.jobs.remove(other)
+        self.scroll = 0
+        self._changed = True
+        return job
+
+    @property
+    def current(self):
+        """The job shown in the output pane, or None"""
+        return self.jobs[-1] if self.jobs else None
+
+    def active(self):
+        """Check whether any job is still running"""
+        return any(job.running for job in self.jobs)
+
+    def poll(self):
+        """Poll every job and return whether any of them changed"""
+        changed, self._changed = self._changed, False
+        for job in self.jobs:
+            changed |= job.poll()
+        return changed
+
+    def cancel(self):
+        """Cancel the most recently started job that is still running"""
+        for job in reversed(self.jobs):
+            if job.running:
+                job.cancel()
+                return job
+        return None
+
+    def cancel_all(self):
+        """Stop every running job, killing any that don't exit in time"""
+        for job in self.jobs:
+            job.cancel()
+        deadline = time.monotonic() + Job.GRACE
+        while self.active() and time.monotonic() < deadline:
+            self.poll()
+            time.sleep(0.01)
+        for job in self.jobs:
+            if job.running:
+                job._signal(signal.SIGKILL)
+
+    def scroll_by(self, lines, height):
+        """Scroll the current job's output, keeping a page of it in view"""
+        job = self.current
+        if job is None:
+            return False
+        limit = max(0, len(job.lines) - height)
+        scroll = min(max(0, self.scroll + lines), limit)
+        if scroll == self.scroll:
+            return False
+        self.scroll = scroll
+        self._changed = True
+        return True
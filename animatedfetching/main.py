@@ -5,28 +5,70 @@ Main application module for AnimatedFetching
 
 import sys
 import os
-import subprocess
 import time
 from rich.console import Console, Group
 from rich.panel import Panel
-from rich.columns import Columns
 from rich.text import Text
-from rich.layout import Layout
 from rich.table import Table
-from rich.prompt import Prompt
-from rich.live import Live
 from rich.align import Align
+from rich.segment import Segment
 
 from .config import Config
-from .sysinfo import SystemInfo
-from .animation import AnimatedGIF
+from .sysinfo import SystemInfo, Refresher
+from .animation import AnimatedGIF, FrameScheduler
+from .cache import FrameCache, InfoCache
+from .snapshot import Snapshot, show as show_snapshot
+from .terminal import SYNC_BEGIN, SYNC_END, KeyReader, write_all
+from .timings import Timings
+from .formats import FORMATS, info_keys, info_cache
+
+
+class PrerenderedLines:
+    """A renderable that lays out a static renderable once per width
+    
+    Rendering replays the cached lines, so only content around it has to
+    be laid out again. Call invalidate() when the underlying data changes.
+    """
+    
+    def __init__(self, renderable):
+        self.renderable = renderable
+        self._width = None
+        self._lines = None
+    
+    def invalidate(self, renderable=None):
+        """Drop the cached lines, optionally swapping in new content"""
+        if renderable is not None:
+            self.renderable = renderable
+        self._width = None
+        self._lines = None
+    
+    def lines(self, console, options):
+        """Get the rendered lines for the options' width"""
+        if self._lines is None or self._width != options.max_width:
+            self._lines = console.render_lines(self.renderable, options, pad=False)
+            self._width = options.max_width
+        return self._lines
+    
+    def __rich_console__(self, console, options):
+        new_line = Segment.line()
+        for line in self.lines(console, options):
+            yield from line
+            yield new_line
 
 
 class AnimatedFetching:
     """Main application class"""
     
-    def __init__(self, config_path=None):
-        self.console = Console()
+    # Seconds between checks for a finished refresh or output from
+    # running commands, when nothing animates
+    WATCH_TICK = 0.25
+    # Seconds between wakeups when waiting for nothing but keypresses
+    IDLE_TICK = 60.0
+    
+    def __init__(self, config_path=None, timings=None):
+        # Records --timings; a disabled one costs next to nothing
+        self.timings = timings or Timings()
+        self.console = Console(file=self.timings.wrap(sys.stdout)) if self.timings.enabled else Console()
         
         # Auto-create config if it doesn't exist and no custom path is specified
         default_config_path = Config.DEFAULT_CONFIG_PATH
@@ -36,19 +78,82 @@ class AnimatedFetching:
             self.console.print("[green]✓ Setup complete! You can customize the config at:[/green]")
             self.console.print(f"  {default_config_path}\n")
         
-        self.config = Config.load(config_path)
-        self.sysinfo = SystemInfo.get_all()
+        self.config_path = config_path
+        with self.timings.phase('config'):
+            self.config = Config.load(config_path)
+        
+        # Collect system info in the background while the GIF decodes
+        collection = self.collect_sysinfo()
         
         # Load animation if enabled
-        self.animation = None
-        if self.config.get('animation', {}).get('enabled', False):
-            gif_path = self.config['animation'].get('path')
-            if gif_path and os.path.exists(os.path.expanduser(gif_path)):
-                self.animation = AnimatedGIF(
-                    gif_path,
-                    width=self.config['animation'].get('width', 40),
-                    fps=self.config['animation'].get('fps', 10)
-                )
+        self.playback_stats = None
+        self.jobs = None  # Background button commands, in interactive mode
+        # Playback timing, replaceable to run the animation on a fake clock
+        self.clock = time.monotonic
+        self.sleep = time.sleep
+        with self.timings.phase('animation'):
+            self.animation = self.load_animation()
+        if self.animation is not None:
+            for step, seconds in self.animation.load_times.items():
+                self.timings.add('animation.' + step, seconds)
+        
+        with self.timings.phase('sysinfo'):
+            self.sysinfo = collection.result()
+        self.timings.collection(collection)
+    
+    def collect_sysinfo(self):
+        """Start collecting the info the layout shows, returning the Collection"""
+        sysinfo_config = self.config.get('sysinfo', {})
+        return SystemInfo.start(
+            timeouts=sysinfo_config.get('timeouts'),
+            cache=self._info_cache(self.config),
+            policies=sysinfo_config.get('policies'),
+            keys=self._info_keys(self.config)
+        )
+    
+    def load_animation(self, **overrides):
+        """Load the configured GIF, or None if animation is disabled or it is missing
+        
+        Keyword arguments override the animation settings from the config.
+        """
+        animation_config = self.config.get('animation', {})
+        if not animation_config.get('enabled', False):
+            return None
+        gif_path = animation_config.get('path')
+        if not gif_path or not os.path.exists(os.path.expanduser(gif_path)):
+            return None
+        
+        settings = dict(
+            width=animation_config.get('width', 40),
+            fps=animation_config.get('fps', 10),
+            cache=self._frame_cache(self.config),
+            streaming=animation_config.get('streaming', False),
+            window=animation_config.get('window', 32),
+            mode=animation_config.get('mode', 'block'),
+            color_depth=animation_config.get('color_depth', 'auto'),
+            lru=animation_config.get('lru', 8),
+            resample=animation_config.get('resample', 'bicubic'),
+            max_source_pixels=animation_config.get('max_source_pixels'),
+            max_frames=animation_config.get('max_frames'),
+            max_decode_mb=animation_config.get('max_decode_mb')
+        )
+        settings.update(overrides)
+        return AnimatedGIF(gif_path, **settings)
+    
+    @staticmethod
+    def _frame_cache(config):
+        """Create the on-disk frame cache if caching is enabled"""
+        cache_config = config.get('cache', {})
+        if not cache_config.get('enabled', True):
+            return None
+        return FrameCache(
+            cache_dir=cache_config.get('path'),
+            max_bytes=int(cache_config.get('max_size_mb', 64) * 1024 * 1024)
+        )
+    
+    # Shared with --format, which runs without rich
+    _info_keys = staticmethod(info_keys)
+    _info_cache = staticmethod(info_cache)
     
     def render_info_section(self):
         """Render system information section"""
@@ -110,147 +215,462 @@ class AnimatedFetching:
             border_style="blue"
         )
     
-    def display(self):
-        """Display the fetch information"""
-        # Clear screen
-        self.console.clear()
+    def display(self, watch=False, keys=None):
+        """Display the fetch information
         
-        # Create title
+        With watch, keep the display up and refresh dynamic info until
+        interrupted. With a KeyReader, keep it up until a button's key or
+        'q' is pressed, and return that button (None to quit).
+        """
+        with self.timings.phase('display'):
+            # Clear screen
+            self.console.clear()
+            
+            # If animation is enabled and has multiple frames, show animation
+            if watch or keys is not None or (self.animation and self.animation.get_frame_count() > 1):
+                return self._display_animated(watch, keys)
+            else:
+                self._display_static()
+    
+    def _display_static(self):
+        """Print the title, first frame, info and buttons once"""
         title = self.config.get('layout', {}).get('title', 'System Information')
         title_style = self.config.get('colors', {}).get('title', 'bold cyan')
+        self.console.print(f"\n[{title_style}]{title}[/{title_style}]\n")
+        
+        # Display static GIF if available
+        if self.animation:
+            frame = self.animation.get_static_frame()
+            if frame:
+                self.console.print(Align.center(Text.from_ansi(frame)))
+                self.console.print()  # Add spacing
+        
+        # Display info
+        self.console.print(Align.center(self.render_info_section()))
+        
+        # Display buttons
+        buttons_panel = self.render_buttons()
+        if buttons_panel:
+            self.console.print("\n")
+            self.console.print(buttons_panel)
+        
+        self.console.print("")
+    
+    def save_snapshot(self, width):
+        """Save the static output at this width for the next login, if enabled"""
+        import io
+        from .snapshot import Snapshot
+        
+        snapshot_config = self.config.get('snapshot', {})
+        if not snapshot_config.get('enabled', False):
+            return
+        
+        console = self.console
+        self.console = Console(file=io.StringIO(), force_terminal=True, width=width)
+        try:
+            self._display_static()
+            output = self.console.file.getvalue()
+        finally:
+            self.console = console
         
-        # If animation is enabled and has multiple frames, show animation
-        if self.animation and self.animation.get_frame_count() > 1:
-            self._display_animated()
+        sources = [os.path.realpath(os.path.expanduser(self.config_path or Config.DEFAULT_CONFIG_PATH))]
+        if self.animation:
+            sources.append(os.path.realpath(self.animation.gif_path))
+        Snapshot(self.config_path, width).store(output, sources, snapshot_config.get('max_age', 3600))
+    
+    def _render_footer(self, hint=False):
+        """Build the info table and buttons shown below the animation"""
+        footer = [Align.center(self.render_info_section())]
+        buttons_panel = self.render_buttons()
+        if buttons_panel:
+            footer += ["", buttons_panel]
+        if hint and self.jobs is not None:
+            footer += ["", self.render_jobs()]
+        if hint:
+            footer.append(Text("Press a key to run an action, or 'q' to quit", style="dim"))
+        return Group(*footer)
+    
+    def _pane_height(self):
+        return max(1, self.config.get('jobs', {}).get('pane_height', 6))
+    
+    def render_jobs(self):
+        """Render the output pane for button commands, always the same height"""
+        height = self._pane_height()
+        job = self.jobs.current
+        if job is None:
+            return Panel(
+                Text("Command output appears here", style="dim"),
+                title="[bold]Output[/bold]", border_style="blue", height=height + 2
+            )
+        
+        lines = job.snapshot()
+        end = len(lines) - self.jobs.scroll
+        output = [Text.from_ansi(line, no_wrap=True, overflow="ellipsis") for line in lines[max(0, end - height):end]]
+        
+        if job.running:
+            status = "[yellow]running[/yellow]"
+        elif job.status == "done":
+            status = f"[green]done in {job.elapsed():.1f}s[/green]"
+        elif job.status == "failed" and job.returncode is not None:
+            status = f"[red]failed (exit {job.returncode})[/red]"
         else:
-            # Static display
-            self.console.print(f"\n[{title_style}]{title}[/{title_style}]\n")
-            
-            # Display static GIF if available
-            if self.animation:
-                frame = self.animation.get_static_frame()
-                if frame:
-                    self.console.print(Align.center(frame))
-                    self.console.print()  # Add spacing
-            
-            # Display info
-            self.console.print(Align.center(self.render_info_section()))
-            
-            # Display buttons
-            buttons_panel = self.render_buttons()
-            if buttons_panel:
-                self.console.print("\n")
-                self.console.print(buttons_panel)
-            
-            self.console.print("")
+            status = f"[red]{job.status}[/red]"
+        
+        hints = ["↑/↓ scroll"]
+        if job.running:
+            hints.insert(0, "x cancel")
+        others = sum(other.running for other in self.jobs.jobs if other is not job)
+        if others:
+            hints.insert(0, f"{others} more running")
+        
+        return Panel(
+            Group(*output), title=f"[bold]{job.label}[/bold] · {status}",
+            subtitle=f"[dim]{' · '.join(hints)}[/dim]", border_style="blue", height=height + 2
+        )
+    
+    def _refresher(self, watch):
+        """Create the refresher for dynamic info in watch mode"""
+        if not watch:
+            return None
+        intervals = dict(SystemInfo.REFRESH, **self.config.get('sysinfo', {}).get('refresh', {}))
+        return Refresher(self.sysinfo, intervals, clock=self.clock)
     
-    def _display_animated(self):
+    def _key_sleep(self, keys, scheduler, pressed):
+        """Build a scheduler sleep that wakes up as soon as a key is typed
+        
+        A button's key starts its command in the background, and 'x', the
+        arrow and page keys cancel or scroll it, waking the scheduler to
+        redraw. 'q', or a button marked interactive, stops the scheduler
+        and the button (None for quit) is appended to pressed, since it
+        needs the terminal to itself. Other keys are ignored.
+        """
+        buttons = {button['key']: button for button in self.config.get('buttons', []) if button.get('key')}
+        scroll = {'up': -1, 'down': 1, 'page up': -self._pane_height(), 'page down': self._pane_height()}
+        
+        def sleep(seconds):
+            typed = keys.read(seconds)
+            for key in [None] if typed is None else typed:
+                if key is None or key.lower() == 'q':
+                    pressed.append(None)
+                elif key in buttons and (self.jobs is None or buttons[key].get('interactive')):
+                    pressed.append(buttons[key])
+                elif key in buttons:
+                    button = buttons[key]
+                    if button.get('command'):
+                        self.jobs.start(button.get('label', key), button['command'], button.get('timeout'))
+                        scheduler.wake()
+                    continue
+                elif self.jobs is not None and key == 'x':
+                    if self.jobs.cancel():
+                        scheduler.wake()
+                    continue
+                elif self.jobs is not None and key in scroll:
+                    # Scrolling back moves away from the end of the output
+                    if self.jobs.scroll_by(-scroll[key], self._pane_height()):
+                        scheduler.wake()
+                    continue
+                else:
+                    continue
+                scheduler.stop()
+                return
+        
+        return sleep
+    
+    def _display_animated(self, watch=False, keys=None):
         """Display with animated GIF"""
         title = self.config.get('layout', {}).get('title', 'System Information')
         title_style = self.config.get('colors', {}).get('title', 'bold cyan')
         
-        # Render static content
-        info_table = self.render_info_section()
-        buttons_panel = self.render_buttons()
+        # Static content is laid out once per terminal width
+        header = PrerenderedLines(Group(Align.center(Text(title, style=title_style)), ""))
+        hint = keys is not None
+        footer = PrerenderedLines(self._render_footer(hint))
+        refresher = self._refresher(watch)
+        jobs = self.jobs if hint else None
+        refresh = None
+        if refresher is not None or jobs is not None:
+            def refresh():
+                """Re-collect due info and check on jobs, returning whether the footer changed"""
+                changed = refresher is not None and bool(refresher.poll())
+                changed |= jobs is not None and jobs.poll()
+                if changed:
+                    footer.invalidate(self._render_footer(hint))
+                return changed
         
         # Create the display layout
         def generate_display():
             """Generate the current display with animation frame"""
-            output = []
-            
-            # Title
-            title_text = Text(title, style=title_style)
-            output.append(Align.center(title_text))
-            output.append("")
+            output = [header]
             
             # Get current animation frame
-            frame = self.animation.get_current_frame()
+            frame = self.animation.get_current_frame() if self.animation else ""
             if frame:
                 # Center the frame
-                output.append(Align.center(frame))
-            
-            # Add info table (centered)
-            output.append(Align.center(info_table))
+                output.append(Align.center(Text.from_ansi(frame)))
             
-            # Add buttons if present
-            if buttons_panel:
-                output.append("")
-                output.append(buttons_panel)
-            
-            # Combine all elements
-            from rich.console import Group
+            output.append(footer)
             return Group(*output)
         
         # Run animation with Live display
-        self.animation.reset()
+        if self.animation:
+            self.animation.reset()
+        
+        scheduler = self._scheduler(watch or keys is not None, refresher)
+        pressed = []
+        if keys is not None:
+            scheduler.sleep = self._key_sleep(keys, scheduler, pressed)
         
-        with Live(generate_display(), console=self.console, refresh_per_second=10, screen=False) as live:
-            try:
-                # Animation duration (default 5 seconds for non-interactive mode)
-                start_time = time.time()
-                duration = 5  # Show animation for 5 seconds
+        if not self._display_direct(generate_display, header, footer, scheduler, refresh):
+            from rich.live import Live
+            
+            with Live(generate_display(), console=self.console, auto_refresh=False, screen=False) as live:
+                try:
+                    for index in scheduler:
+                        if self.animation:
+                            self.animation.current_frame = index
+                        if refresh is not None:
+                            refresh()
+                        live.update(generate_display(), refresh=True)
+                except KeyboardInterrupt:
+                    pass
+            self.playback_stats = scheduler.stats()
+            
+            # Show final static frame
+            self.console.print()
+        
+        return pressed[0] if pressed else None
+    
+    def _scheduler(self, loop=False, refresher=None):
+        """Create the frame scheduler for one run of the animation"""
+        if loop and not self.animation:
+            # Nothing to animate: only wake up when a refresh is due, or
+            # often enough to show output from running commands
+            def tick(index):
+                if self.jobs is not None and self.jobs.active():
+                    return self.WATCH_TICK
+                due = refresher.next_due() if refresher is not None else None
+                if due is None:
+                    return self.IDLE_TICK
+                return min(self.IDLE_TICK, max(self.WATCH_TICK, due - self.clock()))
+            return FrameScheduler(1, tick, clock=self.clock, sleep=self.sleep)
+        if loop:
+            # Keep animating until interrupted
+            return self.animation.scheduler(budget=None, loop=True, clock=self.clock, sleep=self.sleep)
+        # Animation duration (default 5 seconds for non-interactive mode)
+        budget = self.config['animation'].get('duration', 5) or None
+        return self.animation.scheduler(budget=budget, clock=self.clock, sleep=self.sleep)
+    
+    def show_playback_stats(self):
+        """Print how closely the last playback kept to the GIF's timing"""
+        stats = self.playback_stats
+        if not stats:
+            self.console.print("[yellow]No animation was played[/yellow]")
+            return
+        self.console.print(
+            f"Playback: {stats['shown']} frames in {stats['elapsed']:.2f}s, "
+            f"{stats['actual_fps']:.1f} fps (target {stats['target_fps']:.1f}), "
+            f"{stats['dropped']} dropped"
+        )
+    
+    def _capture_lines(self, renderable):
+        """Render to a list of ANSI lines, as the console would print it"""
+        with self.console.capture() as capture:
+            self.console.print(renderable)
+        return capture.get().split("\n")[:-1]
+    
+    @staticmethod
+    def _changed_rows(old_lines, new_lines):
+        """Build output repainting only the lines that differ
+        
+        The cursor starts, and ends, at the start of the line just below
+        the last one.
+        """
+        output = []
+        for row, (old, new) in enumerate(zip(old_lines, new_lines)):
+            if old != new:
+                up = len(old_lines) - row
+                output.append(f"\033[{up}A\r{new}\033[K\033[{up}B\r")
+        return "".join(output)
+    
+    def _display_direct(self, generate_display, header, footer, scheduler, refresh=None):
+        """Play the animation by writing frames straight to the terminal
+        
+        Rich prints the layout once; after that each tick is a single
+        os.write that moves the cursor up into the frame and writes either
+        the frame's delta or a full repaint, wrapped in a synchronized
+        update so the terminal never shows a half-drawn frame. When
+        refresh() reports a changed footer, only the rows that changed are
+        repainted. Returns False when the terminal can't be driven this way.
+        """
+        console = self.console
+        if self.config['animation'].get('output', 'direct') != 'direct' or not console.is_terminal:
+            return False
+        try:
+            fd = console.file.fileno()
+        except (AttributeError, OSError, ValueError):
+            return False
+        
+        # Rich would wrap frame rows wider than the terminal, and the
+        # cursor-relative repaints would then land in the wrong rows
+        if self.animation and console.width < self.animation.width:
+            return False
+        
+        options = console.options
+        frame = self.animation.get_current_frame() if self.animation else ""
+        frame_rows = frame.count("\n") + 1 if frame else 0
+        frame_top = len(header.lines(console, options))
+        footer_lines = self._capture_lines(footer) if refresh is not None else None
+        layout_height = frame_top + frame_rows + len(footer.lines(console, options))
+        if layout_height > console.height:
+            return False
+        
+        console.print(generate_display())
+        console.show_cursor(False)
+        console.file.flush()
+        
+        up = layout_height - frame_top
+        if self.animation:
+            column = f"\033[{max(0, (console.width - self.animation.width) // 2) + 1}G"
+            shown = self.animation.current_frame
+            count = self.animation.get_frame_count()
+        else:
+            shown = 0
+        
+        try:
+            for index in scheduler:
+                output = ""
+                if refresh is not None and refresh():
+                    new_lines = self._capture_lines(footer)
+                    if len(new_lines) == len(footer_lines):
+                        output = self._changed_rows(footer_lines, new_lines)
+                        footer_lines = new_lines
                 
-                while time.time() - start_time < duration:
-                    frame_duration = self.animation.next_frame()
-                    live.update(generate_display())
-                    time.sleep(frame_duration)
+                if index != shown:
+                    self.animation.current_frame = index
+                    delta = self.animation.get_current_delta() if index == (shown + 1) % count else None
+                    if delta is None:
+                        frame = self.animation.get_current_frame()
+                        text, end_row = frame.replace("\n", "\n" + column), frame.count("\n")
+                    else:
+                        text, end_row = delta.text, delta.row
                     
-            except KeyboardInterrupt:
-                pass
+                    back_down = f"\033[{up - end_row}B" if up > end_row else ""
+                    output += f"\033[{up}A{column}{text}{back_down}\r"
+                    shown = index
+                
+                if output:
+                    data = f"{SYNC_BEGIN}{output}{SYNC_END}".encode('utf-8')
+                    with self.timings.phase('display.write'):
+                        write_all(fd, data)
+                    self.timings.count('bytes_written', len(data))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            console.show_cursor(True)
+        self.playback_stats = scheduler.stats()
         
-        # Show final static frame
-        self.console.print()
+        console.print()
+        return True
     
-    def run_interactive(self):
+    def run_interactive(self, watch=False):
         """Run in interactive mode with button support"""
-        self.display()
+        import subprocess
+        from .jobs import JobRunner
         
         if not self.config.get('buttons'):
+            self.display(watch)
             return
         
-        self.console.print("[dim]Press a key to run an action, or 'q' to quit[/dim]")
-        
-        # Create key mapping
-        key_map = {}
-        for button in self.config['buttons']:
-            key = button.get('key')
-            if key:
-                key_map[key] = button
-        
-        while True:
-            try:
-                choice = Prompt.ask("\nChoice", default="q")
-                
-                if choice.lower() == 'q':
+        jobs_config = self.config.get('jobs', {})
+        self.jobs = JobRunner(
+            timeout=jobs_config.get('timeout'),
+            max_lines=jobs_config.get('max_lines', 1000)
+        )
+        keys = KeyReader()
+        try:
+            while True:
+                with keys:
+                    button = self.display(watch, keys)
+                if button is None:
                     break
                 
-                if choice in key_map:
-                    button = key_map[choice]
-                    command = button.get('command')
-                    if command:
-                        self.console.print(f"\n[bold green]Running:[/bold green] {command}\n")
-                        try:
-                            # Run command in interactive shell
-                            subprocess.run(command, shell=True)
-                        except Exception as e:
-                            self.console.print(f"[bold red]Error:[/bold red] {e}")
-                        
-                        self.console.print("\n[dim]Press Enter to continue...[/dim]")
-                        input()
-                        self.display()
-                        self.console.print("[dim]Press a key to run an action, or 'q' to quit[/dim]")
-                else:
-                    self.console.print("[yellow]Invalid choice. Try again.[/yellow]")
-            
-            except KeyboardInterrupt:
-                self.console.print("\n[yellow]Interrupted[/yellow]")
-                break
-            except EOFError:
-                break
+                # Interactive commands get the terminal to themselves
+                command = button.get('command')
+                if command:
+                    self.console.print(f"\n[bold green]Running:[/bold green] {command}\n")
+                    try:
+                        # Run command in interactive shell
+                        subprocess.run(command, shell=True)
+                    except Exception as e:
+                        self.console.print(f"[bold red]Error:[/bold red] {e}")
+                    
+                    self.console.print("\n[dim]Press any key to continue...[/dim]")
+                    with keys:
+                        if keys.read() is None:
+                            break
+        
+        except KeyboardInterrupt:
+            self.console.print("\n[yellow]Interrupted[/yellow]")
+        finally:
+            self.jobs.cancel_all()
     
-    def run(self):
+    def run(self, watch=False):
         """Run the application (non-interactive)"""
-        self.display()
+        self.display(watch)
+        if not watch and self.console.is_terminal:
+            with self.timings.phase('snapshot'):
+                self.save_snapshot(self.console.width)
+    
+    def close(self):
+        """Release background resources"""
+        if self.animation:
+            self.animation.stop()
+    
+    def timings_report(self):
+        """Get the --timings report for this run so far"""
+        if self.animation is not None:
+            self.timings.set('frames', self.animation.get_frame_count())
+            self.timings.set('frames_decoded', self.animation.frames_decoded)
+            self.timings.set('source_frames', self.animation.source_frames)
+        stats = self.playback_stats
+        if stats:
+            self.timings.set('frames_shown', stats['shown'])
+            self.timings.set('frames_dropped', stats['dropped'])
+            self.timings.set('actual_fps', stats['actual_fps'])
+            self.timings.set('target_fps', stats['target_fps'])
+        return self.timings.report()
+    
+    def show_frame_stats(self):
+        """Print per-frame output sizes before and after run encoding"""
+        if not self.animation or not self.animation.get_frame_count():
+            self.console.print("[yellow]No animation loaded[/yellow]")
+            return
+        
+        stats = self.animation.encoding_stats()
+        table = Table(title="Frame Encoding", box=None, padding=(0, 1))
+        table.add_column("Frame", justify="right")
+        table.add_column("Per-cell bytes", justify="right")
+        table.add_column("Encoded bytes", justify="right")
+        
+        for index, (raw, encoded) in enumerate(zip(stats['raw_bytes'], stats['encoded_bytes'])):
+            table.add_row(str(index), str(raw), str(encoded))
+        
+        table.add_row(
+            Text("Total", style="bold"),
+            Text(str(stats['raw_total']), style="bold"),
+            Text(f"{stats['encoded_total']} ({stats['ratio']:.0%})", style="bold")
+        )
+        self.console.print(table)
+        self.console.print(f"Frame memory: {self.animation.memory_bytes() / 1024:.1f} KiB")
+
+
+def show_timings(report, format='text'):
+    """Print a --timings report to stderr"""
+    if format == 'json':
+        import json
+        print(json.dumps(report, indent=2), file=sys.stderr)
+    else:
+        print("\n".join(Timings.format(report)), file=sys.stderr)
 
 
 def main():
@@ -275,6 +695,56 @@ def main():
         action='store_true',
         help='Run in interactive mode with button support'
     )
+    parser.add_argument(
+        '-w', '--watch',
+        action='store_true',
+        help='Keep animating and refresh memory, CPU usage and other dynamic info until interrupted'
+    )
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='Keep everything loaded and serve plain afetch runs over a Unix socket'
+    )
+    parser.add_argument(
+        '--refresh-snapshot',
+        type=int,
+        metavar='WIDTH',
+        help=argparse.SUPPRESS
+    )
+    parser.add_argument(
+        '--clear-cache',
+        action='store_true',
+        help='Remove cached animation frames, system info, snapshots and compiled configs'
+    )
+    parser.add_argument(
+        '--frame-stats',
+        action='store_true',
+        help='Show per-frame output bytes before and after encoding'
+    )
+    parser.add_argument(
+        '--playback-stats',
+        action='store_true',
+        help='Show actual vs target fps and dropped frames after the animation'
+    )
+    parser.add_argument(
+        '--format',
+        choices=FORMATS,
+        help='Print only the system info, as JSON, label: value lines or ANSI-colored lines, without the animation'
+    )
+    parser.add_argument(
+        '--timings',
+        nargs='?',
+        const='text',
+        choices=['text', 'json'],
+        help='Print per-phase and per-collector durations, bytes written and playback stats to stderr'
+    )
+    parser.add_argument(
+        '--profile',
+        nargs='?',
+        const='afetch.prof',
+        metavar='FILE',
+        help='Run under cProfile and tracemalloc, saving the profile to FILE (default afetch.prof)'
+    )
     
     args = parser.parse_args()
     
@@ -282,13 +752,74 @@ def main():
         config_path = Config.create_default_config(args.config)
         sys.exit(0)
     
-    try:
+    if args.clear_cache:
+        cache_dir = Config.load(args.config).get('cache', {}).get('path')
+        cache = FrameCache(cache_dir=cache_dir)
+        removed = cache.clear()
+        InfoCache(cache_dir=cache_dir).clear()
+        Snapshot.clear()
+        Config.clear_compiled()
+        print(f"Removed {removed} cached animation(s) and system info from {cache.cache_dir}")
+        sys.exit(0)
+    
+    if args.format:
+        from .formats import write
+        
+        write(Config.load(args.config), args.format)
+        sys.exit(0)
+    
+    if args.daemon:
+        from .daemon import Daemon
+        
+        daemon = Daemon(config_path=args.config)
+        try:
+            daemon.serve_forever(ready=lambda: print(f"Listening on {daemon.path}"))
+        except KeyboardInterrupt:
+            pass
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        sys.exit(0)
+    
+    plain = not (args.interactive or args.watch or args.frame_stats or args.playback_stats
+                 or args.timings or args.profile)
+    if plain and args.refresh_snapshot is None and show_snapshot(args.config):
+        sys.exit(0)
+    
+    if args.refresh_snapshot is not None:
+        # Run detached after a snapshot was shown: just render the next one
         app = AnimatedFetching(config_path=args.config)
+        try:
+            app.save_snapshot(args.refresh_snapshot)
+        finally:
+            app.close()
+        sys.exit(0)
+    
+    timings = Timings(enabled=args.timings is not None)
+    
+    def run():
+        app = AnimatedFetching(config_path=args.config, timings=timings)
         
-        if args.interactive:
-            app.run_interactive()
+        try:
+            if args.frame_stats:
+                app.show_frame_stats()
+            elif args.interactive:
+                app.run_interactive(watch=args.watch)
+            else:
+                app.run(watch=args.watch)
+            if args.playback_stats:
+                app.show_playback_stats()
+        finally:
+            app.close()
+            if args.timings:
+                show_timings(app.timings_report(), args.timings)
+    
+    try:
+        if args.profile:
+            from .timings import profile
+            profile(run, args.profile)
         else:
-            app.run()
+            run()
     
     except KeyboardInterrupt:
         print("\nInterrupted")
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Login snapshots for AnimatedFetching
+
+With `snapshot.enabled`, a plain run prints the static output saved by the
+previous run straight away, then refreshes it for next time in a
+detached background process. Like the daemon client, showing a snapshot
+only uses the standard library, so it is fast to import.
+"""
+
+import os
+import sys
+import time
+import hashlib
+
+from .cache import DEFAULT_CACHE_DIR, atomic_write
+from .terminal import write_all
+
+
+class Snapshot:
+    """The static output of a fetch, saved for one terminal width
+
+    File layout (text header, then the output):
+        AFSNAP <format version>
+        <creation time> <maximum age in seconds>
+        <mtime_ns> <path>        one line per source the output depends on
+        (blank line)
+        rendered output
+
+    A snapshot is only shown while it is younger than its maximum age and
+    none of its sources (the config file and GIF) have changed.
+    """
+
+    MAGIC = "AFSNAP"
+    FORMAT_VERSION = 1
+    PREFIX = "snapshot-"
+    SUFFIX = ".ansi"
+
+    # Environment that changes how the output is rendered
+    ENV = ('TERM', 'COLORTERM', 'NO_COLOR')
+
+    def __init__(self, config_path=None, width=80, cache_dir=None, environ=None):
+        environ = os.environ if environ is None else environ
+        self.cache_dir = os.path.expanduser(cache_dir or DEFAULT_CACHE_DIR)
+        parts = [os.path.realpath(os.path.expanduser(config_path)) if config_path else "", width]
+        parts += [environ.get(key, "") for key in self.ENV]
+        key = hashlib.sha1("\0".join(map(str, parts)).encode('utf-8')).hexdigest()[:16]
+        self.path = os.path.join(self.cache_dir, self.PREFIX + key + self.SUFFIX)
+
+    @staticmethod
+    def _stamp(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def load(self, now=None):
+        """Get the saved output if it is still fresh, or None"""
+        now = time.time() if now is None else now
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        header, _, output = data.partition(b"\n\n")
+        try:
+            lines = header.decode('utf-8').split("\n")
+            if lines[0] != f"{self.MAGIC} {self.FORMAT_VERSION}":
+                return None
+            created, max_age = map(float, lines[1].split())
+            for line in lines[2:]:
+                stamp, path = line.split(" ", 1)
+                if str(self._stamp(path)) != stamp:
+                    return None
+        except (UnicodeDecodeError, ValueError, IndexError):
+            return None
+        if not 0 <= now - created <= max_age:
+            return None
+        return output
+
+    def store(self, output, sources, max_age, now=None):
+        """Save rendered output that depends on the given source files"""
+        now = time.time() if now is None else now
+        lines = [f"{self.MAGIC} {self.FORMAT_VERSION}", f"{now} {max_age}"]
+        lines += [f"{self._stamp(path)} {path}" for path in sources if "\n" not in path]
+        data = ("\n".join(lines) + "\n\n").encode('utf-8') + output.encode('utf-8')
+        try:
+            atomic_write(self.path, data)
+        except OSError:
+            pass
+
+    @classmethod
+    def clear(cls, cache_dir=None):
+        """Remove every saved snapshot and return how many were removed"""
+        cache_dir = os.path.expanduser(cache_dir or DEFAULT_CACHE_DIR)
+        try:
+            names = os.listdir(cache_dir)
+        except OSError:
+            return 0
+        removed = 0
+        for name in names:
+            if name.startswith(cls.PREFIX) and name.endswith(cls.SUFFIX):
+                try:
+                    os.unlink(os.path.join(cache_dir, name))
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+
+
+def show(config_path=None, out=None):
+    """Print a fresh snapshot for this terminal and refresh it in the background
+
+    Returns False, having printed nothing, when output isn't a terminal or
+    there is no fresh snapshot for its width.
+    """
+    out = sys.stdout if out is None else out
+    fd = out.fileno()
+    if not os.isatty(fd):
+        return False
+    width = os.get_terminal_size(fd).columns
+    output = Snapshot(config_path, width).load()
+    if output is None:
+        return False
+
+    write_all(fd, output)
+    refresh_in_background(config_path, width)
+    return True
+
+
+def refresh_in_background(config_path, width):
+    """Start a detached process that renders a new snapshot for next time"""
+    import subprocess
+
+    command = [sys.executable, '-m', 'animatedfetching.main', '--refresh-snapshot', str(width)]
+    if config_path:
+        command += ['-c', config_path]
+    try:
+        subprocess.Popen(
+            command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL, start_new_session=True
+        )
+    except OSError:
+        pass
@@ -5,11 +5,161 @@ AnimatedFetching - A terminal fetch program with animated GIF support
 
 import os
 import sys
+import time
 import platform
-import psutil
-import distro
 import socket
-from datetime import datetime
+from datetime import datetime, timedelta
+from queue import Queue, Empty
+from threading import Thread, Event
+
+
+class Collection:
+    """System information being gathered by a small pool of daemon threads
+
+    Every collector has its own deadline, counted from when collection
+    started. A collector that fails or misses its deadline is reported
+    with its fallback value instead; it keeps running in its daemon
+    thread but is no longer waited for.
+    """
+    
+    def __init__(self, collectors, timeouts, fallback, max_workers, known=None, on_collected=None):
+        self.timeouts = timeouts
+        self.fallback = fallback
+        self.known = known or {}  # Values that needed no collecting
+        self.on_collected = on_collected  # Called with the values actually collected
+        self.timed_out = []
+        self.failed = []
+        self.durations = {}  # Seconds each collector that returned took
+        self._start = time.monotonic()
+        self._results = {}
+        self._done = {key: Event() for key in collectors}
+        self._finished = Queue()  # Keys in the order their collectors return
+        self._queue = Queue()
+        for item in collectors.items():
+            self._queue.put(item)
+        for _ in range(min(max_workers, len(collectors))):
+            Thread(target=self._work, daemon=True).start()
+    
+    def _work(self):
+        """Worker thread: run queued collectors until none are left"""
+        while True:
+            try:
+                key, collector = self._queue.get_nowait()
+            except Empty:
+                return
+            start = time.monotonic()
+            try:
+                self._results[key] = collector()
+                self.durations[key] = time.monotonic() - start
+            except Exception:
+                pass
+            self._done[key].set()
+            self._finished.put(key)
+    
+    def _deadline(self, key):
+        return self._start + self.timeouts.get(key, SystemInfo.DEFAULT_TIMEOUT)
+    
+    def ready(self):
+        """Check whether result() would return without waiting"""
+        now = time.monotonic()
+        return all(done.is_set() or now >= self._deadline(key) for key, done in self._done.items())
+    
+    def result(self):
+        """Wait for every collector up to its deadline and return the values"""
+        info = dict(self.known)
+        collected = {}
+        for key, done in self._done.items():
+            if not done.wait(max(0.0, self._deadline(key) - time.monotonic())):
+                self.timed_out.append(key)
+            elif key in self._results:
+                info[key] = collected[key] = self._results[key]
+                continue
+            else:
+                self.failed.append(key)
+            info[key] = self.fallback.get(key, SystemInfo.PLACEHOLDER)
+        
+        if self.on_collected is not None and collected:
+            self.on_collected(collected)
+        return info
+    
+    def as_completed(self):
+        """Yield (key, value) pairs as soon as each value is known
+        
+        Values that needed no collecting come first, then each collector's
+        value as it returns. A collector that fails, or is still running
+        at its deadline, yields its fallback instead. Use either this or
+        result() on a Collection, not both.
+        """
+        yield from self.known.items()
+        collected = {}
+        pending = dict.fromkeys(self._done)
+        while pending:
+            deadline = min(self._deadline(key) for key in pending)
+            try:
+                key = self._finished.get(timeout=max(0.0, deadline - time.monotonic()))
+            except Empty:
+                now = time.monotonic()
+                for key in [key for key in pending if now >= self._deadline(key)]:
+                    del pending[key]
+                    self.timed_out.append(key)
+                    yield key, self.fallback.get(key, SystemInfo.PLACEHOLDER)
+                continue
+            
+            if key not in pending:
+                continue  # Already given its fallback at the deadline
+            del pending[key]
+            if key in self._results:
+                collected[key] = self._results[key]
+                yield key, collected[key]
+            else:
+                self.failed.append(key)
+                yield key, self.fallback.get(key, SystemInfo.PLACEHOLDER)
+        
+        if self.on_collected is not None and collected:
+            self.on_collected(collected)
+
+
+class Refresher:
+    """Re-collects dynamic info keys in the background, each on its own interval
+
+    poll() never blocks: it starts a collection for keys that are due and
+    hands back the values once that collection has finished. Keys whose
+    collector fails or times out keep their current value.
+    """
+    
+    def __init__(self, info, intervals, clock=time.monotonic):
+        self.info = info
+        self.clock = clock
+        now = clock()
+        self.intervals = {key: interval for key, interval in intervals.items() if key in info and interval}
+        self._due = {key: now + interval for key, interval in self.intervals.items()}
+        self._pending = None
+    
+    def next_due(self):
+        """Get the clock time of the next refresh, or None if nothing refreshes"""
+        if self._pending is not None:
+            return self.clock()
+        return min(self._due.values(), default=None)
+    
+    def poll(self):
+        """Start due collections and return {key: value} for values that changed"""
+        if self._pending is not None:
+            if not self._pending.ready():
+                return {}
+            values = self._pending.result()
+            self._pending = None
+            changed = {key: value for key, value in values.items() if self.info.get(key) != value}
+            self.info.update(changed)
+            return changed
+        
+        now = self.clock()
+        due = [key for key, deadline in self._due.items() if deadline <= now]
+        if due:
+            for key in due:
+                self._due[key] = now + self.intervals[key]
+            self._pending = SystemInfo.start(fallback=self.info, keys=due)
+        return {}
+
 
 class SystemInfo:
     """Collects system information similar to fastfetch"""
@@ -18,6 +168,7 @@ class SystemInfo:
     def get_os():
         """Get operating system name"""
         if platform.system() == "Linux":
+            import distro
             return f"{distro.name()} {distro.version()}"
         return f"{platform.system()} {platform.release()}"
     
@@ -34,8 +185,14 @@ class SystemInfo:
     @staticmethod
     def get_uptime():
         """Get system uptime"""
-        boot_time = datetime.fromtimestamp(psutil.boot_time())
-        uptime = datetime.now() - boot_time
+        try:
+            # Cheap on Linux, and avoids importing psutil
+            with open('/proc/uptime', 'r') as f:
+                uptime = timedelta(seconds=float(f.read().split()[0]))
+        except (OSError, ValueError, IndexError):
+            import psutil
+            boot_time = datetime.fromtimestamp(psutil.boot_time())
+            uptime = datetime.now() - boot_time
         days = uptime.days
         hours, remainder = divmod(uptime.seconds, 3600)
         minutes, _ = divmod(remainder, 60)
@@ -75,6 +232,7 @@ class SystemInfo:
     @staticmethod
     def get_memory():
         """Get memory usage"""
+        import psutil
         mem = psutil.virtual_memory()
         used = mem.used / (1024 ** 3)  # Convert to GB
         total = mem.total / (1024 ** 3)
@@ -84,6 +242,7 @@ class SystemInfo:
     def get_disk():
         """Get disk usage"""
         try:
+            import psutil
             disk = psutil.disk_usage('/')
             used = disk.used / (1024 ** 3)  # Convert to GB
             total = disk.total / (1024 ** 3)
@@ -91,17 +250,184 @@ class SystemInfo:
         except:
             return "Unknown"
     
+    _cpu_sampled = False
+    
+    # Shown for CPU usage until there is a previous sample to compare against
+    CPU_PENDING = "…"
+    
     @staticmethod
-    def get_all():
-        """Get all system information"""
-        return {
-            'hostname': SystemInfo.get_hostname(),
-            'os': SystemInfo.get_os(),
-            'kernel': SystemInfo.get_kernel(),
-            'uptime': SystemInfo.get_uptime(),
-            'shell': SystemInfo.get_shell(),
-            'terminal': SystemInfo.get_terminal(),
-            'cpu': SystemInfo.get_cpu(),
-            'memory': SystemInfo.get_memory(),
-            'disk': SystemInfo.get_disk(),
-        }
+    def get_cpu_usage():
+        """Get CPU usage since the previous call
+        
+        The first call only starts the measurement, without blocking, and
+        returns CPU_PENDING; the next refresh shows the real value.
+        """
+        import psutil
+        if not SystemInfo._cpu_sampled:
+            SystemInfo._cpu_sampled = True
+            psutil.cpu_percent(interval=None)
+            return SystemInfo.CPU_PENDING
+        return f"{psutil.cpu_percent(interval=None):.0f}%"
+    
+    # Shown for a value whose collector failed or timed out with nothing cached
+    PLACEHOLDER = "Unknown"
+    
+    # Values from collectors that found nothing, which are never cached
+    UNKNOWN = (PLACEHOLDER, "Unknown CPU", CPU_PENDING)
+    
+    # Seconds each collector may take; disk and distro probing can hang
+    DEFAULT_TIMEOUT = 1.0
+    TIMEOUTS = {'os': 1.5, 'disk': 1.5}
+    
+    # How long each value stays valid between runs: "boot" for the whole
+    # boot, "live" to always collect it, or a number of seconds
+    POLICIES = {
+        'hostname': "boot",
+        'os': "boot",
+        'kernel': "boot",
+        'cpu': "boot",
+        'shell': "live",
+        'terminal': "live",
+        'uptime': "live",
+        'memory': "live",
+        'disk': 60,
+        'cpu_usage': "live",
+    }
+    
+    # Seconds between refreshes in --watch mode; keys not listed never change
+    REFRESH = {
+        'uptime': 30,
+        'memory': 2,
+        'cpu_usage': 2,
+        'disk': 30,
+    }
+    
+    @staticmethod
+    def get_boot_id():
+        """Get an identifier that changes on every boot"""
+        try:
+            with open('/proc/sys/kernel/random/boot_id', 'r') as f:
+                return f.read().strip()
+        except OSError:
+            pass
+        try:
+            import psutil
+            return str(int(psutil.boot_time()))
+        except Exception:
+            return None
+    
+    # Collectors by info key; built-ins are registered below the class
+    _registry = {}
+    _entry_points_loaded = False
+    
+    # Third-party collectors: an entry point named after the info key whose
+    # object is a callable, optionally with `policy` and `timeout` attributes
+    ENTRY_POINT_GROUP = "animatedfetching.collectors"
+    
+    @staticmethod
+    def register(key, collector, policy=None, timeout=None):
+        """Register the collector for an info key, with its cache policy and deadline"""
+        SystemInfo._registry[key] = collector
+        if policy is not None:
+            SystemInfo.POLICIES[key] = policy
+        if timeout is not None:
+            SystemInfo.TIMEOUTS[key] = timeout
+    
+    @staticmethod
+    def _load_entry_points():
+        """Register collectors installed by other packages"""
+        if SystemInfo._entry_points_loaded:
+            return
+        SystemInfo._entry_points_loaded = True
+        
+        try:
+            from importlib.metadata import entry_points
+        except ImportError:
+            return
+        try:
+            found = entry_points(group=SystemInfo.ENTRY_POINT_GROUP)
+        except TypeError:
+            # Python < 3.10 returns a dict of groups
+            found = entry_points().get(SystemInfo.ENTRY_POINT_GROUP, [])
+        
+        for entry_point in found:
+            if entry_point.name in SystemInfo._registry:
+                continue
+            try:
+                collector = entry_point.load()
+            except Exception as e:
+                print(f"Warning: Failed to load collector '{entry_point.name}': {e}")
+                continue
+            SystemInfo.register(
+                entry_point.name,
+                collector,
+                getattr(collector, 'policy', None),
+                getattr(collector, 'timeout', None)
+            )
+    
+    @staticmethod
+    def collectors(keys=None):
+        """Get the collector for each requested info key, or for all of them
+        
+        Installed entry points are only looked up when a key isn't built in.
+        """
+        if keys is None:
+            SystemInfo._load_entry_points()
+            return dict(SystemInfo._registry)
+        
+        if any(key not in SystemInfo._registry for key in keys):
+            SystemInfo._load_entry_points()
+        collectors = {}
+        for key in keys:
+            if key in SystemInfo._registry:
+                collectors[key] = SystemInfo._registry[key]
+            else:
+                print(f"Warning: No collector for info key '{key}'")
+        return collectors
+    
+    @staticmethod
+    def start(timeouts=None, fallback=None, max_workers=4, cache=None, policies=None, keys=None):
+        """Start collecting in the background and return the Collection
+        
+        keys limits collection to those info keys (all of them by default).
+        timeouts overrides per-key deadlines in seconds; fallback supplies
+        values for collectors that don't finish in time. With an InfoCache,
+        values still fresh under their policy are reused without collecting,
+        stale ones become fallbacks, and newly collected ones are stored
+        unless they are one of the UNKNOWN values.
+        """
+        collectors = SystemInfo.collectors(keys)
+        fallback = dict(fallback or {})
+        known = {}
+        on_collected = None
+        
+        if cache is not None:
+            policies = dict(SystemInfo.POLICIES, **(policies or {}))
+            boot_id = SystemInfo.get_boot_id()
+            if boot_id is not None:
+                known, stale = cache.load(boot_id, policies)
+                known = {key: value for key, value in known.items() if key in collectors}
+                fallback.update(stale)
+                collectors = {key: collector for key, collector in collectors.items() if key not in known}
+                on_collected = lambda values: cache.store(boot_id, {
+                    key: value for key, value in values.items() if value not in SystemInfo.UNKNOWN
+                })
+        
+        return Collection(
+            collectors,
+            dict(SystemInfo.TIMEOUTS, **(timeouts or {})),
+            fallback,
+            max_workers,
+            known,
+            on_collected
+        )
+    
+    @staticmethod
+    def get_all(timeouts=None, fallback=None, keys=None):
+        """Get all (or just the requested) system information, collected concurrently"""
+        return SystemInfo.start(timeouts, fallback, keys=keys).result()
+
+
+for _key in ('hostname', 'os', 'kernel', 'uptime', 'shell', 'terminal', 'cpu', 'memory', 'disk', 'cpu_usage'):
+    SystemInfo.register(_key, getattr(SystemInfo, 'get_' + _key))
+del _key
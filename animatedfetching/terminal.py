@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Terminal capabilities and escape sequences for AnimatedFetching
+
+Kept free of heavy imports so the startup path can use it without
+loading NumPy.
+"""
+
+import os
+from collections import namedtuple
+
+BLOCK = "█"
+UPPER_HALF = "▀"
+RESET = "\033[m"
+
+# Synchronized output (DEC private mode 2026): the terminal holds off
+# drawing between these, and terminals without support ignore them
+SYNC_BEGIN = "\033[?2026h"
+SYNC_END = "\033[?2026l"
+
+# Glyph used for each render mode
+GLYPHS = {"block": BLOCK, "half": UPPER_HALF}
+MODES = tuple(GLYPHS)
+
+# Color depths, from most to fewest colors
+COLOR_DEPTHS = ("truecolor", "256", "16")
+
+
+def detect_color_depth(environ=None):
+    """Guess the terminal's color depth from COLORTERM and TERM"""
+    environ = os.environ if environ is None else environ
+    colorterm = environ.get('COLORTERM', '').lower()
+    term = environ.get('TERM', '').lower()
+    if colorterm in ('truecolor', '24bit') or term.endswith('-direct'):
+        return "truecolor"
+    if '256color' in term:
+        return "256"
+    return "16"
+
+
+def write_all(fd, data):
+    """Write all of data to fd, looping over short writes"""
+    while data:
+        data = data[os.write(fd, data):]
+
+
+class Delta(namedtuple('Delta', ['text', 'row', 'col'])):
+    """Changed spans between two frames, with the cell the cursor ends on
+
+    The text assumes the cursor starts on the frame's top-left cell and only
+    uses relative cursor movement, so it is independent of where the frame
+    sits on screen.
+    """
+
+
+class KeyReader:
+    """Reads keypresses from a terminal as they are typed
+
+    While entered, a terminal is put in cbreak mode so each key arrives
+    without waiting for Enter (Ctrl+C still interrupts); other inputs,
+    such as a pipe, are read as they come. read() sleeps in a selector
+    until there is input or its timeout passes.
+    """
+
+    # Escape sequences reported by name
+    NAMED_KEYS = {
+        "\033[A": "up", "\033[B": "down",
+        "\033[5~": "page up", "\033[6~": "page down",
+    }
+
+    def __init__(self, file=None):
+        import sys
+
+        self.fd = (file or sys.stdin).fileno()
+        self._saved = None
+        self._selector = None
+
+    def __enter__(self):
+        import selectors
+
+        if os.isatty(self.fd):
+            try:
+                import termios
+                import tty
+            except ImportError:
+                pass
+            else:
+                self._saved = termios.tcgetattr(self.fd)
+                tty.setcbreak(self.fd)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self.fd, selectors.EVENT_READ)
+        return self
+
+    def __exit__(self, *exc_info):
+        self._selector.close()
+        self._selector = None
+        if self._saved is not None:
+            import termios
+
+            termios.tcsetattr(self.fd, termios.TCSADRAIN, self._saved)
+            self._saved = None
+
+    def read(self, timeout=None):
+        """Wait up to timeout seconds and return the keys typed
+
+        Returns a list of keys, empty on timeout, or None once the input
+        has ended. Arrow and page keys are named as in NAMED_KEYS; other
+        escape sequences are skipped.
+        """
+        if not self._selector.select(timeout):
+            return []
+        data = os.read(self.fd, 64)
+        if not data:
+            return None
+        text = data.decode('utf-8', 'replace')
+        if text.startswith("\033") and len(text) > 1:
+            key = self.NAMED_KEYS.get(text)
+            return [key] if key else []
+        return [key for key in text if key not in "\r\n"]
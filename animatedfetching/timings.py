@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Timing and profiling instrumentation for AnimatedFetching
+
+`--timings` reports how long each phase of a run took, how long each
+system info collector took, and what playback achieved. `--profile`
+runs the whole fetch under cProfile and tracemalloc. Both are off by
+default, and a disabled Timings records nothing.
+"""
+
+import sys
+import time
+
+
+class _NullPhase:
+    """Context manager that does nothing, shared by every disabled phase"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    """Context manager that adds its duration to a phase"""
+
+    def __init__(self, timings, name):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        # Phases are listed in the order they start, so parents come first
+        self.timings.phases.setdefault(self.name, 0.0)
+        self.start = self.timings.clock()
+        return self
+
+    def __exit__(self, *exc):
+        self.timings.add(self.name, self.timings.clock() - self.start)
+        return False
+
+
+class CountingFile:
+    """A text file wrapper that counts the bytes written through it"""
+
+    def __init__(self, file, timings):
+        self._file = file
+        self._timings = timings
+
+    def write(self, text):
+        self._timings.count('bytes_written', len(text.encode('utf-8', 'replace')))
+        return self._file.write(text)
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+
+class Timings:
+    """Phase durations and counters for one run
+
+    A phase may be entered several times; its durations add up. When
+    disabled, phase() returns a shared no-op context manager and the
+    other hooks return at once, so instrumented code costs a method call.
+    """
+
+    def __init__(self, enabled=False, clock=time.perf_counter):
+        self.enabled = enabled
+        self.clock = clock
+        self.started = clock()
+        self.phases = {}  # Name -> seconds, in the order first entered
+        self.counters = {}
+        self.values = {}
+        self.collectors = {}  # Info key -> seconds its collector took
+        self.timed_out = []
+        self.failed = []
+
+    def phase(self, name):
+        """Time a block as (part of) the named phase"""
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, name)
+
+    def add(self, name, seconds):
+        """Add seconds to a phase"""
+        if self.enabled:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def count(self, name, amount=1):
+        """Add to a counter"""
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def set(self, name, value):
+        """Record a value, replacing any earlier one"""
+        if self.enabled:
+            self.values[name] = value
+
+    def collection(self, collection):
+        """Record per-collector durations from a finished sysinfo Collection"""
+        if self.enabled:
+            self.collectors.update(collection.durations)
+            self.timed_out += collection.timed_out
+            self.failed += collection.failed
+
+    def wrap(self, file):
+        """Wrap a text file so writes to it are counted, when enabled"""
+        return CountingFile(file, self) if self.enabled else file
+
+    @staticmethod
+    def peak_rss():
+        """Get the process's peak resident set size in bytes, or None"""
+        try:
+            import resource
+        except ImportError:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS bytes
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+    def report(self):
+        """Get everything recorded, with durations in milliseconds"""
+        report = {
+            'total_ms': round((self.clock() - self.started) * 1000, 3),
+            'phases_ms': {name: round(seconds * 1000, 3) for name, seconds in self.phases.items()},
+            'collectors_ms': {key: round(seconds * 1000, 3) for key, seconds in sorted(self.collectors.items())},
+            'timed_out': self.timed_out,
+            'failed': self.failed,
+        }
+        report.update(self.counters)
+        report.update(self.values)
+        report['peak_rss_bytes'] = self.peak_rss()
+        return report
+
+    @staticmethod
+    def format(report):
+        """Format a report as aligned text lines"""
+        lines = [f"{'total':<24} {report['total_ms']:>10.1f} ms"]
+        for name, ms in report['phases_ms'].items():
+            # "display.write" is part of "display", so goes under it
+            label = "  " * (name.count('.') + 1) + name.rpartition('.')[2]
+            lines.append(f"{label:<24} {ms:>10.1f} ms")
+        if report['collectors_ms']:
+            lines.append("collectors")
+            for key, ms in report['collectors_ms'].items():
+                lines.append(f"  {key:<22} {ms:>10.1f} ms")
+        for name in ('timed_out', 'failed'):
+            if report[name]:
+                lines.append(f"{name.replace('_', ' '):<24} {', '.join(report[name])}")
+        skip = ('total_ms', 'phases_ms', 'collectors_ms', 'timed_out', 'failed')
+        for name, value in report.items():
+            if name in skip or value is None:
+                continue
+            if isinstance(value, float):
+                value = f"{value:.2f}"
+            lines.append(f"{name:<24} {value:>10}")
+        return lines
+
+
+def profile(function, path, out=None, limit=20):
+    """Run function under cProfile and tracemalloc and report on both
+
+    The cProfile stats are saved to path, for pstats or a viewer such as
+    snakeviz; summaries of the slowest functions and the largest
+    allocations are printed to out (stderr by default).
+    """
+    import cProfile
+    import pstats
+    import tracemalloc
+
+    out = sys.stderr if out is None else out
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    try:
+        return profiler.runcall(function)
+    finally:
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        profiler.dump_stats(path)
+        print(f"\nProfile saved to {path}; slowest {limit} functions by cumulative time:", file=out)
+        pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(limit)
+
+        print(f"Python allocations: {current / 1024:.1f} KiB live, {peak / 1024:.1f} KiB peak; "
+              f"largest {limit} by line:", file=out)
+        for stat in snapshot.statistics('lineno')[:limit]:
+            print(f"  {stat}", file=out)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Compare cold (JSONC parse and merge) and warm (compiled cache) config loads
+
+Usage: python benchmarks/bench_config.py [--repeat 50]
+
+Loads a commented copy of the default config in fresh interpreters, so
+the cold path also pays for importing the JSONC parser, as it does on a
+real launch.
+"""
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+from statistics import median
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from animatedfetching.config import Config
+
+# Times one Config.load, optionally dropping the compiled cache first
+LOAD_SCRIPT = """
+import sys, time
+from animatedfetching.config import Config
+if sys.argv[3] == 'cold':
+    Config.clear_compiled(sys.argv[2])
+start = time.perf_counter()
+Config.load(sys.argv[1], cache_dir=sys.argv[2])
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def load_ms(config_path, cache_dir, mode):
+    result = subprocess.run(
+        [sys.executable, '-c', LOAD_SCRIPT, config_path, cache_dir, mode],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        config_path = os.path.join(cache_dir, 'config.jsonc')
+        with open(config_path, 'w') as f:
+            f.write("// AnimatedFetching Configuration File\n")
+            json.dump(Config.DEFAULT_CONFIG, f, indent=2)
+
+        print(f"{'load':<6} {'median ms':>10} {'min ms':>8}")
+        for mode in ('cold', 'warm'):
+            times = [load_ms(config_path, cache_dir, mode) for _ in range(args.repeat)]
+            print(f"{mode:<6} {median(times):>10.2f} {min(times):>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
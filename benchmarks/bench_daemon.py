@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Compare fetch latency through a running daemon with the cold in-process path
+
+Usage: python benchmarks/bench_daemon.py [--repeat 10]
+
+Both paths use the same config and a warm frame cache; the cold path is
+today's `afetch`, the client path is `afetch` with `afetch --daemon`
+running. Times are to the first byte of output and to the end of it,
+next to a bare interpreter start for reference.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+from statistics import median
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUNDLED_GIF = os.path.join(ROOT, 'animatedfetching', 'resources', 'default_animation.gif')
+
+# What the afetch console script runs
+LAUNCH = "from animatedfetching.daemon import launch; launch()"
+
+
+def timed_run(command, env):
+    """Run a command, returning seconds to its first output byte and to exit"""
+    start = time.perf_counter()
+    process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    process.stdout.read(1)
+    first = time.perf_counter() - start
+    process.stdout.read()
+    process.wait()
+    return first, time.perf_counter() - start
+
+
+def bench(command, env, repeat):
+    runs = [timed_run(command, env) for _ in range(repeat)]
+    return median(run[0] for run in runs) * 1000, median(run[1] for run in runs) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config_path = os.path.join(temp_dir, 'config.jsonc')
+        with open(config_path, 'w') as f:
+            json.dump({
+                "animation": {"enabled": True, "path": BUNDLED_GIF, "duration": 0.01},
+                "cache": {"path": os.path.join(temp_dir, 'cache')},
+            }, f)
+        env = dict(os.environ, PYTHONPATH=ROOT, ANIMATEDFETCHING_SOCKET=os.path.join(temp_dir, 'afetch.sock'))
+
+        # The cold path, which also warms the frame and sysinfo caches
+        cold = [sys.executable, '-m', 'animatedfetching.main', '-c', config_path]
+        subprocess.run(cold, cwd=ROOT, env=env, capture_output=True, check=True)
+        results = [
+            ('python', bench([sys.executable, '-c', 'print()'], env, args.repeat)),
+            ('cold', bench(cold, env, args.repeat)),
+        ]
+
+        daemon = subprocess.Popen(
+            [sys.executable, '-m', 'animatedfetching.main', '--daemon', '-c', config_path],
+            cwd=ROOT, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+        )
+        try:
+            daemon.stdout.readline()  # "Listening on ..."
+            results.append(('daemon', bench([sys.executable, '-c', LAUNCH], env, args.repeat)))
+        finally:
+            daemon.terminate()
+            daemon.wait()
+
+        print(f"{'path':<8} {'first byte ms':>14} {'total ms':>10}")
+        for name, (first, total) in results:
+            print(f"{name:<8} {first:>14.1f} {total:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
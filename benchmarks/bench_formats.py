@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Compare poll latency of --format output with the default rich path
+
+Usage: python benchmarks/bench_formats.py [--repeat 10]
+
+Runs `afetch` the way a status bar polling it would: a fresh process per
+poll, warm sysinfo cache and compiled config. The default path renders
+the static layout with rich (animation disabled, so only layout is
+measured); the --format paths skip rich, Pillow and NumPy entirely.
+Times are to the first byte of output and to exit.
+"""
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+from statistics import median
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_daemon import LAUNCH, timed_run
+
+
+def bench(command, env, repeat):
+    runs = [timed_run(command, env) for _ in range(repeat)]
+    return median(run[0] for run in runs) * 1000, median(run[1] for run in runs) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config_path = os.path.join(temp_dir, 'config.jsonc')
+        with open(config_path, 'w') as f:
+            json.dump({
+                "animation": {"enabled": False},
+                "cache": {"path": os.path.join(temp_dir, 'cache')},
+            }, f)
+        env = dict(os.environ, PYTHONPATH=ROOT, ANIMATEDFETCHING_SOCKET=os.path.join(temp_dir, 'none'))
+
+        def afetch(*options):
+            return [sys.executable, '-c', LAUNCH, '-c', config_path, *options]
+
+        # Warm the sysinfo cache and compiled config
+        subprocess.run(afetch(), cwd=ROOT, env=env, capture_output=True, check=True)
+        results = [('python', bench([sys.executable, '-c', 'print()'], env, args.repeat))]
+        results.append(('default', bench(afetch(), env, args.repeat)))
+        for format in ('json', 'plain', 'ansi'):
+            results.append((format, bench(afetch('--format', format), env, args.repeat)))
+
+        print(f"{'path':<8} {'first byte ms':>14} {'total ms':>10}")
+        for name, (first, total) in results:
+            print(f"{name:<8} {first:>14.1f} {total:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
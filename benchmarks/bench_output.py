@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Compare per-frame CPU time of the direct and rich Live animation outputs
+
+Usage: python benchmarks/bench_output.py [--width 40] [--seconds 3]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+from rich.console import Console
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from animatedfetching.main import AnimatedFetching
+from bench_render_modes import BUNDLED_GIF, make_synthetic_gif
+
+
+def bench(config_path, devnull):
+    """Play the animation once and return (CPU ms per frame, frames shown)"""
+    app = AnimatedFetching(config_path=config_path)
+    app.console = Console(file=devnull, force_terminal=True, width=160, height=100)
+    start = time.process_time()
+    app.display()
+    cpu = time.process_time() - start
+    shown = app.playback_stats['shown']
+    app.close()
+    return cpu * 1000 / max(shown, 1), shown
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--width', type=int, default=40)
+    parser.add_argument('--seconds', type=float, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir, open(os.devnull, 'w') as devnull:
+        synthetic = os.path.join(temp_dir, 'synthetic.gif')
+        make_synthetic_gif(synthetic)
+
+        print(f"{'GIF':<12} {'output':<8} {'frames':>7} {'CPU ms/frame':>13}")
+        for name, path in (('bundled', BUNDLED_GIF), ('synthetic', synthetic)):
+            for output in ('live', 'direct'):
+                config_path = os.path.join(temp_dir, 'config.jsonc')
+                with open(config_path, 'w') as f:
+                    json.dump({
+                        "animation": {
+                            "enabled": True, "path": path, "width": args.width,
+                            "duration": args.seconds, "output": output,
+                        },
+                        "buttons": [],
+                        "cache": {"enabled": False},
+                    }, f)
+                ms, shown = bench(config_path, devnull)
+                print(f"{name:<12} {output:<8} {shown:>7} {ms:>13.3f}")
+
+
+if __name__ == '__main__':
+    main()
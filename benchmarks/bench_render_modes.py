@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Compare output size and conversion time of the animation render modes
+
+Usage: python benchmarks/bench_render_modes.py [--width 40] [--repeat 3]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from animatedfetching.animation import AnimatedGIF
+from animatedfetching.ansi import MODES
+
+BUNDLED_GIF = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'animatedfetching', 'resources', 'default_animation.gif'
+)
+
+
+def make_synthetic_gif(path, size=(320, 240), frames=60, colors=64):
+    """Write a deterministic GIF: a gradient with a moving square"""
+    width, height = size
+    x = np.linspace(0, 255, width, dtype=np.uint8)
+    y = np.linspace(0, 255, height, dtype=np.uint8)
+    base = np.zeros((height, width, 3), dtype=np.uint8)
+    base[..., 0] = x[np.newaxis, :]
+    base[..., 1] = y[:, np.newaxis]
+    base[..., 2] = 128
+
+    images = []
+    for index in range(frames):
+        frame = base.copy()
+        left = (index * 5) % (width - 40)
+        frame[height // 3:height // 3 + 40, left:left + 40] = (255, 255, 255)
+        images.append(Image.fromarray(frame).quantize(colors=colors))
+    images[0].save(path, save_all=True, append_images=images[1:], duration=50, loop=0)
+
+
+def bench(gif_path, width, mode, repeat):
+    """Return (best seconds per frame, mean encoded bytes, mean per-cell bytes, rows)"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        gif = AnimatedGIF(gif_path, width=width, mode=mode)
+        elapsed = (time.perf_counter() - start) / max(gif.get_frame_count(), 1)
+        best = elapsed if best is None else min(best, elapsed)
+
+    stats = gif.encoding_stats()
+    rows = gif.get_static_frame().count("\n") + 1
+    return best, stats['encoded_total'] / stats['frames'], stats['raw_total'] / stats['frames'], rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--width', type=int, default=40)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        synthetic = os.path.join(temp_dir, 'synthetic.gif')
+        make_synthetic_gif(synthetic)
+
+        print(f"{'GIF':<12} {'mode':<6} {'rows':>5} {'px rows':>8} {'ms/frame':>9} "
+              f"{'bytes/frame':>12} {'per-cell':>10} {'bytes/px row':>13}")
+        for name, path in (('bundled', BUNDLED_GIF), ('synthetic', synthetic)):
+            for mode in MODES:
+                seconds, encoded, raw, rows = bench(path, args.width, mode, args.repeat)
+                pixel_rows = rows * 2 if mode == 'half' else rows
+                print(f"{name:<12} {mode:<6} {rows:>5} {pixel_rows:>8} {seconds * 1000:>9.2f} "
+                      f"{encoded:>12.0f} {raw:>10.0f} {encoded / pixel_rows:>13.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Check import time and lazily loaded modules against the startup budget
+
+Usage: python benchmarks/bench_startup.py [--repeat 5] [--budget benchmarks/startup_budget.json]
+
+Exits non-zero when a budget is exceeded, so it can gate CI.
+"""
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUNDLED_GIF = os.path.join(ROOT, 'animatedfetching', 'resources', 'default_animation.gif')
+
+# Loads frames that are already cached, then reports what got imported
+CACHED_FRAMES_SCRIPT = """
+import sys, json
+from animatedfetching.animation import AnimatedGIF
+from animatedfetching.cache import FrameCache
+gif = AnimatedGIF(sys.argv[1], cache=FrameCache(sys.argv[2]), color_depth="truecolor")
+assert gif.get_frame_count() > 0
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def import_ms(module, repeat):
+    """Return the best cumulative import time of a module in a fresh interpreter"""
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        micros = None
+        for line in result.stderr.splitlines():
+            fields = line.split('|')
+            if len(fields) == 3 and fields[2].strip() == module:
+                micros = int(fields[1])
+        if micros is None:
+            raise RuntimeError(f"-X importtime reported no import of {module}; is it already imported at startup?")
+        best = micros if best is None else min(best, micros)
+    return best / 1000
+
+
+def imported_modules(code, *args):
+    """Run code in a fresh interpreter and return the modules it imported"""
+    result = subprocess.run(
+        [sys.executable, '-c', code, *args],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return set(json.loads(result.stdout.splitlines()[-1]))
+
+
+def loaded(modules, names):
+    """Return the names (or their submodules) present in modules"""
+    return [name for name in names if any(m == name or m.startswith(name + '.') for m in modules)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--budget', default=os.path.join(ROOT, 'benchmarks', 'startup_budget.json'))
+    args = parser.parse_args()
+
+    with open(args.budget) as f:
+        budget = json.load(f)
+    failures = []
+
+    print(f"{'import':<28} {'ms':>8} {'budget':>8}")
+    for module, limit in budget['import_ms'].items():
+        ms = import_ms(module, args.repeat)
+        print(f"{module:<28} {ms:>8.1f} {limit:>8}")
+        if ms > limit:
+            failures.append(f"importing {module} took {ms:.1f}ms (budget {limit}ms)")
+
+    modules = imported_modules("import sys, json, animatedfetching.main; print(json.dumps(sorted(sys.modules)))")
+    for name in loaded(modules, budget['never_imported']):
+        failures.append(f"importing animatedfetching.main loads {name}")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # The first run fills the cache, the second must be served from it
+        imported_modules(CACHED_FRAMES_SCRIPT, BUNDLED_GIF, cache_dir)
+        modules = imported_modules(CACHED_FRAMES_SCRIPT, BUNDLED_GIF, cache_dir)
+        for name in loaded(modules, budget['never_imported_with_cached_frames']):
+            failures.append(f"loading cached frames imports {name}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("Startup is within budget")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Run the benchmark suite and compare the results against a baseline
+
+Usage:
+    python benchmarks/run_suite.py --output results.json
+    python benchmarks/run_suite.py --baseline results.json [--tolerance 0.25]
+
+Covers GIF conversion (AnimatedGIF._load_frames and _image_to_ascii),
+bytes emitted per frame, playback CPU and wire bytes, SystemInfo.get_all,
+Config.load and end-to-end afetch startup, on deterministic synthetic
+GIFs. Playback runs on a fake clock into a null terminal sink, so the
+frames shown and bytes written are the same on every run.
+
+Every metric is lower-is-better. Byte counts are deterministic and fail
+the comparison if they grow at all; times fail when they grow by more
+than the tolerance. Exits non-zero on a regression, so it can gate CI.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+from statistics import median
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from rich.console import Console
+
+from animatedfetching.animation import AnimatedGIF
+from animatedfetching.config import Config
+from animatedfetching.main import AnimatedFetching
+from animatedfetching.sysinfo import SystemInfo
+from bench_render_modes import make_synthetic_gif
+
+FORMAT_VERSION = 1
+
+# Synthetic GIFs: name -> (size, frames, palette colors)
+GIFS = {
+    'small': ((160, 120), 12, 16),
+    'medium': ((320, 240), 60, 64),
+    'large': ((640, 480), 120, 256),
+}
+QUICK_GIFS = ('small', 'medium')
+
+
+class FakeClock:
+    """Monotonic clock that only moves when slept on"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class NullTerminal(AnimatedFetching):
+    """App whose direct output is counted instead of written"""
+
+    written = 0
+
+    def _write(self, fd, data):
+        self.written += len(data)
+
+
+def best_ms(function, repeat):
+    """Best wall time of function() over repeat runs, in milliseconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def bench_conversion(metrics, name, path, repeat):
+    """Frame loading, per-frame conversion and encoded size"""
+    gif = AnimatedGIF(path, cache=None, color_depth="truecolor")
+    count = gif.get_frame_count()
+
+    def load():
+        fresh = AnimatedGIF.__new__(AnimatedGIF)
+        fresh.__dict__.update(gif.__dict__, frames=[], frame_durations=[], raw_frame_bytes=[])
+        fresh._load_frames()
+
+    metrics[f'load_frames.{name}.ms_per_frame'] = best_ms(load, repeat) / count
+
+    from PIL import Image
+
+    img = Image.open(path)
+    images = []
+    for index in range(count):
+        img.seek(index)
+        images.append(Image.fromarray(gif._resize_frame(img)))
+    metrics[f'image_to_ascii.{name}.ms_per_frame'] = best_ms(
+        lambda: [gif._image_to_ascii(image) for image in images], repeat) / count
+
+    for depth in ('truecolor', '256', '16'):
+        stats = AnimatedGIF(path, cache=None, color_depth=depth).encoding_stats()
+        metrics[f'encoded.{name}.{depth}.bytes_per_frame'] = stats['encoded_total'] / stats['frames']
+
+
+def bench_playback(metrics, name, config_path, devnull):
+    """CPU and bytes on the wire per frame of direct output playback"""
+    app = NullTerminal(config_path=config_path)
+    clock = FakeClock()
+    app.clock, app.sleep = clock, clock.sleep
+    app.console = Console(file=devnull, force_terminal=True, width=160, height=100)
+    start = time.process_time()
+    app.display()
+    cpu = time.process_time() - start
+    shown = app.playback_stats['shown']
+    app.close()
+    metrics[f'playback.{name}.cpu_ms_per_frame'] = cpu * 1000 / shown
+    metrics[f'playback.{name}.wire_bytes_per_frame'] = app.written / shown
+
+
+def bench_sysinfo(metrics, repeat):
+    metrics['sysinfo.get_all_ms'] = median(
+        best_ms(SystemInfo.get_all, 1) for _ in range(repeat))
+
+
+def bench_config(metrics, temp_dir, repeat):
+    """Cold (parse and merge) and warm (compiled) config loads"""
+    config_path = os.path.join(temp_dir, 'default-config.jsonc')
+    with open(config_path, 'w') as f:
+        f.write("// AnimatedFetching Configuration File\n")
+        json.dump(Config.DEFAULT_CONFIG, f, indent=2)
+    cache_dir = os.path.join(temp_dir, 'config-cache')
+
+    def cold():
+        Config.clear_compiled(cache_dir)
+        Config.load(config_path, cache_dir=cache_dir)
+
+    metrics['config.load_cold_ms'] = best_ms(cold, repeat)
+    metrics['config.load_warm_ms'] = best_ms(lambda: Config.load(config_path, cache_dir=cache_dir), repeat)
+
+
+def bench_startup(metrics, config_path, repeat):
+    """Wall time of a whole afetch run with a warm cache, in a fresh interpreter"""
+    command = [sys.executable, '-m', 'animatedfetching.main', '-c', config_path]
+    env = dict(os.environ, PYTHONPATH=ROOT, ANIMATEDFETCHING_SOCKET=os.path.join(os.path.dirname(config_path), 'none'))
+    subprocess.run(command, cwd=ROOT, env=env, capture_output=True, check=True)
+    metrics['startup.afetch_ms'] = best_ms(
+        lambda: subprocess.run(command, cwd=ROOT, env=env, capture_output=True, check=True), repeat)
+
+
+def run(quick=False):
+    repeat = 2 if quick else 5
+    metrics = {}
+    with tempfile.TemporaryDirectory() as temp_dir, open(os.devnull, 'w') as devnull:
+        for name in QUICK_GIFS if quick else GIFS:
+            size, frames, colors = GIFS[name]
+            path = os.path.join(temp_dir, f'{name}.gif')
+            make_synthetic_gif(path, size=size, frames=frames, colors=colors)
+            bench_conversion(metrics, name, path, repeat)
+
+            config_path = os.path.join(temp_dir, f'{name}.jsonc')
+            with open(config_path, 'w') as f:
+                json.dump({
+                    "animation": {"enabled": True, "path": path, "duration": 2, "color_depth": "truecolor"},
+                    "buttons": [],
+                    "cache": {"enabled": False},
+                }, f)
+            bench_playback(metrics, name, config_path, devnull)
+
+        bench_sysinfo(metrics, repeat)
+        bench_config(metrics, temp_dir, repeat)
+
+        config_path = os.path.join(temp_dir, 'startup.jsonc')
+        with open(config_path, 'w') as f:
+            json.dump({
+                "animation": {"enabled": True, "path": os.path.join(temp_dir, 'small.gif'), "duration": 0.01},
+                "cache": {"path": os.path.join(temp_dir, 'cache')},
+            }, f)
+        bench_startup(metrics, config_path, repeat)
+
+    return {
+        'version': FORMAT_VERSION,
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'quick': quick,
+        },
+        'metrics': metrics,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Return a line per regression of results against baseline"""
+    regressions = []
+    for name, base in sorted(baseline['metrics'].items()):
+        value = results['metrics'].get(name)
+        if value is None:
+            continue
+        allowed = base if name.endswith('bytes_per_frame') else base * (1 + tolerance)
+        if value > allowed + 1e-9:
+            regressions.append(f"{name}: {value:.3f} vs baseline {base:.3f} ({value / base - 1:+.0%})"
+                               if base else f"{name}: {value:.3f} vs baseline 0")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--output', help='Write results to this JSON file')
+    parser.add_argument('--baseline', help='Compare against results from an earlier run')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed relative slowdown for timings (default 0.25)')
+    parser.add_argument('--quick', action='store_true', help='Fewer GIFs and repeats')
+    args = parser.parse_args()
+
+    results = run(args.quick)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print(f"{'metric':<44} {'value':>12} {'baseline':>12}")
+    for name, value in sorted(results['metrics'].items()):
+        base = baseline['metrics'].get(name) if baseline else None
+        print(f"{name:<44} {value:>12.3f} {'' if base is None else f'{base:.3f}':>12}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against the baseline")
+
+
+if __name__ == '__main__':
+    main()
@@ -42,11 +42,12 @@ setup(
         "psutil>=5.9.0",
         "distro>=1.8.0",
         "jsoncomment>=0.4.2",
+        "numpy>=1.21.0",
     ],
     entry_points={
         "console_scripts": [
-            "animatedfetching=animatedfetching.main:main",
-            "afetch=animatedfetching.main:main",
+            "animatedfetching=animatedfetching.daemon:launch",
+            "afetch=animatedfetching.daemon:launch",
         ],
     },
 )
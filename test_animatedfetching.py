@@ -30,6 +30,188 @@ def test_sysinfo():
     return True
 
 
+def test_sysinfo_timeouts():
+    """Test a slow or failing collector falls back without stalling the rest"""
+    print("Testing SystemInfo timeouts...")
+    
+    import time
+    from animatedfetching.sysinfo import Collection
+    
+    def fail():
+        raise OSError("no such mount")
+    
+    collectors = {
+        'fast': lambda: "ok",
+        'slow': lambda: time.sleep(5) or "late",
+        'cached': lambda: time.sleep(5) or "late",
+        'broken': fail,
+    }
+    start = time.monotonic()
+    collection = Collection(collectors, {'slow': 0.2, 'cached': 0.2}, {'cached': "last"}, 4)
+    info = collection.result()
+    assert time.monotonic() - start < 1.0
+    assert info == {'fast': "ok", 'slow': SystemInfo.PLACEHOLDER, 'cached': "last",
+                    'broken': SystemInfo.PLACEHOLDER}
+    assert collection.timed_out == ['slow', 'cached']
+    assert collection.failed == ['broken']
+    
+    print("✓ SystemInfo timeouts test passed")
+    return True
+
+
+def test_sysinfo_cache():
+    """Test cached system info is reused per field policy and boot"""
+    print("Testing SystemInfo cache...")
+    
+    import tempfile
+    from animatedfetching.cache import InfoCache
+    
+    policies = {'os': "boot", 'disk': 60, 'memory': "live"}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = InfoCache(temp_dir)
+        cache.store("boot-1", {'os': "Linux", 'disk': "1GB", 'memory': "2GB"}, now=1000)
+        
+        fresh, stale = cache.load("boot-1", policies, now=1030)
+        assert fresh == {'os': "Linux", 'disk': "1GB"}
+        assert stale == {'memory': "2GB"}
+        
+        fresh, stale = cache.load("boot-1", policies, now=1100)
+        assert fresh == {'os': "Linux"}
+        assert stale == {'disk': "1GB", 'memory': "2GB"}
+        
+        # A reboot invalidates everything
+        assert cache.load("boot-2", policies) == ({}, {})
+        
+        # Fresh values skip their collectors; the rest are collected and stored
+        boot_id = SystemInfo.get_boot_id()
+        cache.store(boot_id, {'os': "Cached OS", 'memory': "old"})
+        collection = SystemInfo.start(cache=cache)
+        info = collection.result()
+        assert info['os'] == "Cached OS"
+        assert info['memory'] != "old"
+        assert 'os' not in collection._done
+        fresh, _ = cache.load(boot_id, SystemInfo.POLICIES)
+        assert fresh['kernel'] == info['kernel']
+        
+        # A collector that found nothing is tried again on the next run
+        cache.clear()
+        get_cpu = SystemInfo._registry['cpu']
+        SystemInfo._registry['cpu'] = lambda: "Unknown CPU"
+        try:
+            assert SystemInfo.start(cache=cache, keys=['cpu', 'kernel']).result()['cpu'] == "Unknown CPU"
+        finally:
+            SystemInfo._registry['cpu'] = get_cpu
+        fresh, _ = cache.load(boot_id, SystemInfo.POLICIES)
+        assert 'cpu' not in fresh and 'kernel' in fresh
+        
+        with open(cache.path, 'w') as f:
+            f.write("{not json")
+        assert cache.load(boot_id, policies) == ({}, {})
+    
+    print("✓ SystemInfo cache test passed")
+    return True
+
+
+def test_sysinfo_refresher():
+    """Test watch mode only re-collects keys that are due"""
+    print("Testing SystemInfo refresher...")
+    
+    import time
+    from animatedfetching.sysinfo import Refresher
+    
+    calls = []
+    
+    def get_counter():
+        calls.append('counter')
+        return str(len(calls))
+    
+    SystemInfo.register('test_counter', get_counter)
+    try:
+        now = [0.0]
+        info = {'os': "Test OS", 'test_counter': "0"}
+        refresher = Refresher(info, {'test_counter': 2, 'os': None, 'missing': 1}, clock=lambda: now[0])
+        assert refresher.intervals == {'test_counter': 2}
+        assert refresher.next_due() == 2
+        assert refresher.poll() == {}
+        assert calls == []
+        
+        now[0] = 2.5
+        assert refresher.poll() == {}
+        deadline = time.monotonic() + 5
+        changed = {}
+        while not changed and time.monotonic() < deadline:
+            time.sleep(0.01)
+            changed = refresher.poll()
+        assert changed == {'test_counter': "1"}
+        assert info == {'os': "Test OS", 'test_counter': "1"}
+        assert calls == ['counter']
+        assert refresher.next_due() == 4.5
+    finally:
+        SystemInfo._registry.pop('test_counter')
+        SystemInfo.POLICIES.pop('test_counter', None)
+        SystemInfo.TIMEOUTS.pop('test_counter', None)
+    
+    # Without an animation, watch mode sleeps until the next refresh is due
+    import json
+    import tempfile
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config_path = os.path.join(temp_dir, 'config.jsonc')
+        with open(config_path, 'w') as f:
+            json.dump({"animation": {"enabled": False}, "cache": {"enabled": False}}, f)
+        app = AnimatedFetching(config_path=config_path)
+        now = [10.0]
+        app.clock = lambda: now[0]
+        refresher = Refresher({'memory': "1GB"}, {'memory': 2}, clock=app.clock)
+        tick = app._scheduler(loop=True, refresher=refresher).frame_duration
+        assert tick(0) == 2
+        now[0] = 11.9
+        assert tick(0) == app.WATCH_TICK
+        assert app._scheduler(loop=True).frame_duration(0) == app.IDLE_TICK
+    
+    # The first CPU usage sample doesn't block; the next refresh has the value
+    SystemInfo._cpu_sampled = False
+    start = time.perf_counter()
+    assert SystemInfo.get_cpu_usage() == SystemInfo.CPU_PENDING
+    assert time.perf_counter() - start < 0.05
+    assert SystemInfo.get_cpu_usage().endswith("%")
+    
+    print("✓ SystemInfo refresher test passed")
+    return True
+
+
+def test_collector_registry():
+    """Test only the keys the layout references are collected"""
+    print("Testing collector registry...")
+    
+    calls = []
+    
+    def get_gpu():
+        calls.append('gpu')
+        return "Test GPU"
+    
+    SystemInfo.register('test_gpu', get_gpu, policy="boot", timeout=2.0)
+    try:
+        assert SystemInfo.POLICIES['test_gpu'] == "boot"
+        assert SystemInfo.get_all(keys=['os', 'kernel']).keys() == {'os', 'kernel'}
+        assert calls == []
+        assert SystemInfo.get_all(keys=['test_gpu']) == {'test_gpu': "Test GPU"}
+        assert calls == ['gpu']
+        assert SystemInfo.get_all(keys=['no_such_key']) == {}
+    finally:
+        SystemInfo._registry.pop('test_gpu')
+        SystemInfo.POLICIES.pop('test_gpu')
+        SystemInfo.TIMEOUTS.pop('test_gpu')
+    
+    config = {
+        'layout': {'show_hostname': False},
+        'info_sections': [{'key': 'cpu'}, {'key': 'os'}, {'key': 'cpu'}],
+    }
+    assert AnimatedFetching._info_keys(config) == ['cpu', 'os']
+    
+    print("✓ Collector registry test passed")
+    return True
+
+
 def test_config():
     """Test configuration loading"""
     print("Testing Config...")
@@ -51,6 +233,51 @@ def test_config():
     return True
 
 
+def test_config_cache():
+    """Test merged configs are compiled once and never share the defaults"""
+    print("Testing compiled config cache...")
+    
+    import json
+    import tempfile
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config_path = os.path.join(temp_dir, 'config.jsonc')
+        with open(config_path, 'w') as f:
+            f.write("// Test config\n")
+            json.dump({"animation": {"width": 30}, "buttons": {"not": "a list"}}, f)
+        
+        config = Config.load(config_path, cache_dir=temp_dir)
+        assert config['animation']['width'] == 30
+        assert config['animation']['fps'] == Config.DEFAULT_CONFIG['animation']['fps']
+        assert config['buttons'] == Config.DEFAULT_CONFIG['buttons']
+        compiled = Config._compiled_path(config_path, temp_dir)
+        assert os.path.exists(compiled)
+        
+        # The compiled copy is used while the file is unchanged
+        with open(compiled) as f:
+            data = json.load(f)
+        data['config']['animation']['width'] = 31
+        with open(compiled, 'w') as f:
+            json.dump(data, f)
+        assert Config.load(config_path, cache_dir=temp_dir)['animation']['width'] == 31
+        os.utime(config_path, ns=(0, 0))
+        assert Config.load(config_path, cache_dir=temp_dir)['animation']['width'] == 30
+        
+        # Changing a loaded config leaves the defaults alone
+        config['animation']['fps'] = 1
+        config['buttons'][0]['key'] = "z"
+        defaults = Config.load(os.path.join(temp_dir, 'missing.jsonc'))
+        defaults['layout']['title'] = "Changed"
+        assert Config.DEFAULT_CONFIG['animation']['fps'] != 1
+        assert Config.DEFAULT_CONFIG['buttons'][0]['key'] != "z"
+        assert Config.DEFAULT_CONFIG['layout']['title'] != "Changed"
+        
+        assert Config.clear_compiled(temp_dir) == 1
+    
+    print("✓ Compiled config cache test passed")
+    return True
+
+
 def test_app_initialization():
     """Test application initialization"""
     print("Testing AnimatedFetching initialization...")
@@ -151,6 +378,989 @@ def test_first_run_setup():
         return False
 
 
+def _decode_ansi(frame):
+    """Decode block-character ANSI output back into packed colors per cell"""
+    import re
+    
+    levels = (0, 95, 135, 175, 215, 255)
+    grid = []
+    for line in frame.split("\n"):
+        row, color = [], None
+        for match in re.finditer(r"\033\[([0-9;]*)m|(█)", line):
+            if match.group(2):
+                row.append(color)
+                continue
+            params = [int(p) for p in match.group(1).split(";") if p]
+            if not params or params == [0]:
+                color = None
+            elif params[1] == 2:
+                color = (params[2] << 16) | (params[3] << 8) | params[4]
+            elif params[2] >= 232:
+                value = 8 + 10 * (params[2] - 232)
+                color = (value << 16) | (value << 8) | value
+            else:
+                n = params[2] - 16
+                color = (levels[n // 36] << 16) | (levels[n // 6 % 6] << 8) | levels[n % 6]
+        grid.append(row)
+    return grid
+
+
+def test_ansi_conversion():
+    """Test run-merged frame encoding against the per-cell reference"""
+    print("Testing ANSI conversion...")
+    
+    import numpy as np
+    from animatedfetching.ansi import encode_frames, encode_rgb, cell_bytes, pack_rgb
+    
+    rng = np.random.default_rng(0)
+    colors = np.array([[0, 0, 0], [255, 0, 0], [8, 8, 8], [1, 2, 3], [95, 135, 255]], dtype=np.uint8)
+    stack = colors[rng.integers(0, len(colors), size=(3, 5, 7))]
+    
+    def reference(rgb):
+        lines = []
+        for row in rgb.tolist():
+            lines.append("".join(f"\033[38;2;{r};{g};{b}m█\033[0m" for r, g, b in row))
+        return "\n".join(lines)
+    
+    encoded = encode_frames(stack)
+    assert len(encoded) == 3
+    for frame, rgb in zip(encoded, stack):
+        assert _decode_ansi(frame) == pack_rgb(rgb).tolist()
+        assert _decode_ansi(frame) == _decode_ansi(reference(rgb))
+        assert len(frame.encode()) < len(reference(rgb).encode())
+    assert encode_rgb(stack[0]) == encoded[0]
+    assert cell_bytes(stack) == [len(reference(rgb).encode()) for rgb in stack]
+    assert encode_rgb(np.zeros((0, 4, 3), dtype=np.uint8)) == ""
+    
+    print("✓ ANSI conversion test passed")
+    return True
+
+
+def test_frame_cache():
+    """Test the on-disk frame cache round trip and eviction"""
+    print("Testing FrameCache...")
+    
+    import tempfile
+    import shutil
+    from animatedfetching.animation import AnimatedGIF
+    from animatedfetching.cache import FrameCache
+    
+    temp_dir = tempfile.mkdtemp()
+    try:
+        gif_path = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)),
+            'animatedfetching', 'resources', 'default_animation.gif'
+        )
+        cache = FrameCache(cache_dir=temp_dir)
+        
+        cold = AnimatedGIF(gif_path, width=20, cache=cache)
+        warm = AnimatedGIF(gif_path, width=20, cache=cache)
+        assert cold.get_frame_count() > 1
+        assert warm.get_frame_count() == cold.get_frame_count()
+        assert list(warm.frames) == list(cold.frames)
+        assert warm.frame_durations == cold.frame_durations
+        assert warm.raw_frame_bytes == cold.raw_frame_bytes
+        assert warm.plays == cold.plays
+        
+        # Another width is a separate entry
+        AnimatedGIF(gif_path, width=10, cache=cache)
+        assert len(os.listdir(temp_dir)) == 2
+        
+        # Corrupt entries are treated as misses
+        key = cache.key(gif_path, 20, "block")
+        with open(os.path.join(temp_dir, key + FrameCache.SUFFIX), 'wb') as f:
+            f.write(b"garbage")
+        assert cache.load(key) is None
+        
+        # A tiny size cap evicts down to the limit
+        small = FrameCache(cache_dir=temp_dir, max_bytes=1)
+        small.store("a" * 40, ["x"], [0.1], [10])
+        assert len(os.listdir(temp_dir)) == 0
+        
+        cache.store("b" * 40, ["y"], [0.1], [10])
+        assert cache.clear() == 1
+    finally:
+        shutil.rmtree(temp_dir)
+    
+    print("✓ FrameCache test passed")
+    return True
+
+
+def test_streaming_frames():
+    """Test streaming decode matches a full decode within a bounded window"""
+    print("Testing streaming frames...")
+    
+    from animatedfetching.animation import AnimatedGIF
+    
+    gif_path = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        'animatedfetching', 'resources', 'default_animation.gif'
+    )
+    full = AnimatedGIF(gif_path, width=20)
+    streamed = AnimatedGIF(gif_path, width=20, streaming=True, window=4)
+    try:
+        assert streamed.thread is not None
+        assert streamed.get_frame_count() == full.get_frame_count()
+        assert streamed.get_static_frame() == full.frames[0]
+        
+        # Play two loops; every frame must match even after eviction
+        for _ in range(2 * full.get_frame_count()):
+            assert streamed.get_current_frame() == full.frames[streamed.current_frame]
+            assert len(streamed.frames.resident()[0]) <= 4
+            streamed.next_frame()
+        
+        assert streamed.frames.evicted > 0
+        assert streamed.frame_durations == full.frame_durations
+    finally:
+        streamed.stop()
+    assert streamed.thread is None
+    
+    # Eviction drops the frame furthest behind the playhead, never one ahead
+    from animatedfetching.animation import StreamingFrames
+    frames = StreamingFrames(None, 10, 3)
+    for index in range(3):
+        frames.put(index, f"frame {index}")
+    assert frames[0] == "frame 0" and frames[1] == "frame 1"
+    frames.put(3, "frame 3")
+    assert sorted(frames.resident()[0]) == [1, 2, 3]
+    frames.put(9, "frame 9")  # Behind the playhead, so evicted at once
+    assert sorted(frames.resident()[0]) == [1, 2, 3]
+    assert frames.evicted == 2
+    
+    print("✓ Streaming frames test passed")
+    return True
+
+
+def test_half_block_mode():
+    """Test half-block rendering packs two pixel rows per line"""
+    print("Testing half-block mode...")
+    
+    import numpy as np
+    from animatedfetching.animation import AnimatedGIF
+    from animatedfetching.ansi import encode_rgb, cell_bytes
+    
+    rgb = np.array([
+        [[255, 0, 0], [0, 0, 255]],
+        [[0, 0, 0], [255, 255, 255]],
+    ], dtype=np.uint8)
+    expected = "\033[38;5;196;48;5;16m▀\033[38;5;21;48;5;231m▀\033[m"
+    assert encode_rgb(rgb, "half") == expected
+    assert cell_bytes(rgb[np.newaxis], "half") == [33 + 39]
+    
+    # Only the changed color is re-emitted along a run of cells
+    rgb = np.array([[[255, 0, 0]] * 3, [[0, 0, 0], [0, 0, 0], [1, 2, 3]]], dtype=np.uint8)
+    assert encode_rgb(rgb, "half") == "\033[38;5;196;48;5;16m▀▀\033[48;2;1;2;3m▀\033[m"
+    
+    gif_path = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        'animatedfetching', 'resources', 'default_animation.gif'
+    )
+    block = AnimatedGIF(gif_path, width=20)
+    half = AnimatedGIF(gif_path, width=20, mode="half")
+    assert half.get_frame_count() == block.get_frame_count()
+    assert half.get_static_frame().count("\n") == block.get_static_frame().count("\n")
+    assert "▀" in half.get_static_frame()
+    assert AnimatedGIF(gif_path, width=20, mode="bogus").mode == "block"
+    
+    print("✓ Half-block mode test passed")
+    return True
+
+
+def _paint(screen, text, row=0, col=0):
+    """Apply ANSI output to a {(row, col): (fg, bg, char)} screen, starting at a cell"""
+    import re
+    fg = bg = None
+    for match in re.finditer(r"\033\[([\d;]*)([ABCDm])|\n|(.)", text):
+        params, op, char = match.group(1), match.group(2), match.group(3)
+        if char is not None:
+            screen[(row, col)] = (fg, bg, char)
+            col += 1
+        elif op is None:
+            row, col = row + 1, 0
+        elif op == "m":
+            values = params.split(";") if params else []
+            if not values:
+                fg = bg = None
+            while values:
+                kind, form = values[0], values[1]
+                size = 3 if form == "5" else 5
+                color = tuple(values[1:size])
+                values = values[size:]
+                if kind == "38":
+                    fg = color
+                else:
+                    bg = color
+        else:
+            step = int(params or 1)
+            if op == "A":
+                row -= step
+            elif op == "B":
+                row += step
+            elif op == "C":
+                col += step
+            else:
+                col -= step
+    return row, col
+
+
+def test_delta_frames():
+    """Test deltas repaint each frame from the previous one"""
+    print("Testing delta frames...")
+    
+    import tempfile
+    import numpy as np
+    from animatedfetching.ansi import encode_deltas
+    from animatedfetching.cache import FrameCache
+    
+    # A square sliding across a flat background changes only a few cells
+    stack = np.zeros((4, 6, 12, 3), dtype=np.uint8)
+    stack[..., 2] = 90
+    for i in range(4):
+        stack[i, 2:4, 2 * i:2 * i + 2] = [255, 255, 255]
+    
+    for mode in ("block", "half"):
+        frames, deltas = encode_deltas(stack, mode)
+        assert all(delta is not None for delta in deltas)
+        assert all(len(delta.text) < len(frame) for frame, delta in zip(frames, deltas))
+        
+        screen = {}
+        _paint(screen, frames[-1])
+        for frame, delta in zip(frames, deltas):
+            assert _paint(screen, delta.text) == (delta.row, delta.col)
+            expected = {}
+            _paint(expected, frame)
+            assert screen == expected
+    
+    # Noise changes nearly every cell, so a full repaint is used instead
+    noise = np.random.default_rng(0).integers(0, 256, (2, 4, 8, 3), dtype=np.uint8)
+    assert encode_deltas(noise)[1] == [None, None]
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = FrameCache(temp_dir)
+        frames, deltas = encode_deltas(stack)
+        deltas[1] = None
+        cache.store("b" * 40, frames, [0.1] * 4, [1] * 4, deltas)
+        cached = cache.load("b" * 40)[3]
+        assert [cached[i] for i in range(4)] == deltas
+    
+    print("✓ Delta frames test passed")
+    return True
+
+
+def test_decode_limits():
+    """Test large GIFs are sampled at fps past the caps, keeping their total duration"""
+    print("Testing decode limits...")
+    
+    import tempfile
+    from PIL import Image
+    from animatedfetching.animation import AnimatedGIF
+    from animatedfetching.cache import FrameCache
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        gif_path = os.path.join(temp_dir, 'long.gif')
+        images = [Image.new('RGB', (200, 100), (index * 6, 0, 255 - index * 6)).quantize(colors=8)
+                  for index in range(40)]
+        images[0].save(gif_path, save_all=True, append_images=images[1:], duration=20, loop=0)
+        
+        def load(**settings):
+            return AnimatedGIF(gif_path, width=20, color_depth="truecolor", **settings)
+        
+        full = load()
+        assert full.get_frame_count() == full.frames_decoded == full.source_frames == 40
+        assert abs(sum(full.frame_durations) - 0.8) < 1e-9
+        
+        # A large source is sampled down to the target fps
+        large = load(max_source_pixels=10000, fps=10)
+        assert large.get_frame_count() == 8 and large.source_frames == 40
+        assert all(abs(duration - 0.1) < 1e-9 for duration in large.frame_durations)
+        assert large.get_static_frame() == full.get_static_frame()
+        
+        # Frames without a delay still sample as if they had one
+        instant = os.path.join(temp_dir, 'instant.gif')
+        images[0].save(instant, save_all=True, append_images=images[1:], duration=0, loop=0)
+        sampled = AnimatedGIF(instant, width=20, color_depth="truecolor", max_source_pixels=10000, fps=5)
+        assert sampled.get_frame_count() == 20
+        
+        # Frame and memory caps are never exceeded
+        capped = load(max_frames=6, fps=100)
+        assert 1 < capped.get_frame_count() <= 6
+        assert abs(sum(capped.frame_durations) - 0.8) < 1e-9
+        frame_bytes = 20 * 5 * 3
+        tight = load(max_decode_mb=frame_bytes * 3 / (1024 * 1024), fps=100)
+        assert 1 < tight.get_frame_count() <= 3
+        assert load(max_decode_mb=1e-9).get_frame_count() == 1
+        
+        # Every filter gives frames of the same shape; unknown ones fall back
+        for resample in ('nearest', 'box', 'lanczos'):
+            assert load(resample=resample).get_static_frame().count("\n") == 4
+        assert load(resample="sinc").resample == "bicubic"
+        
+        cache = FrameCache(cache_dir=os.path.join(temp_dir, 'cache'))
+        nearest = AnimatedGIF(gif_path, width=20, cache=cache, resample="nearest")
+        bicubic = AnimatedGIF(gif_path, width=20, cache=cache, resample="bicubic")
+        assert nearest.cache_key != bicubic.cache_key
+    
+    print("✓ Decode limits test passed")
+    return True
+
+
+def test_color_depths():
+    """Test 256 and 16 color output and color depth detection"""
+    print("Testing color depths...")
+    
+    import numpy as np
+    from animatedfetching.animation import AnimatedGIF
+    from animatedfetching.ansi import detect_color_depth, encode_rgb, quantize
+    
+    assert detect_color_depth({'COLORTERM': 'truecolor', 'TERM': 'xterm'}) == "truecolor"
+    assert detect_color_depth({'TERM': 'xterm-256color'}) == "256"
+    assert detect_color_depth({'TERM': 'screen-256color', 'COLORTERM': ''}) == "256"
+    assert detect_color_depth({'TERM': 'linux'}) == "16"
+    
+    rgb = np.array([[[250, 5, 5], [0, 0, 240], [118, 118, 118]]], dtype=np.uint8)
+    assert quantize(rgb, "256").tolist() == [[196, 21, 243]]
+    assert quantize(rgb, "16").tolist() == [[9, 4, 8]]
+    assert encode_rgb(rgb, depth="256") == "\033[38;5;196m█\033[38;5;21m█\033[38;5;243m█\033[m"
+    assert encode_rgb(rgb, depth="16") == "\033[91m█\033[34m█\033[90m█\033[m"
+    assert encode_rgb(rgb, "half", "16") == "\033[91;101m▀\033[34;44m▀\033[90;100m▀\033[m"
+    
+    gif_path = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        'animatedfetching', 'resources', 'default_animation.gif'
+    )
+    sizes = {}
+    for depth in ("truecolor", "256", "16"):
+        animation = AnimatedGIF(gif_path, width=20, color_depth=depth)
+        assert animation.color_depth == depth
+        sizes[depth] = animation.encoding_stats()['encoded_total']
+    assert sizes["16"] < sizes["256"] < sizes["truecolor"]
+    
+    print("✓ Color depths test passed")
+    return True
+
+
+def test_indexed_frames():
+    """Test frames stored as palette indices encode like the full strings"""
+    print("Testing indexed frames...")
+    
+    import numpy as np
+    from animatedfetching.animation import AnimatedGIF
+    from animatedfetching.ansi import IndexedFrames, encode_deltas
+    
+    stack = np.zeros((12, 20, 40, 3), dtype=np.uint8)
+    stack[..., 1] = np.arange(40) // 8 * 50
+    for i in range(12):
+        stack[i, :, :, 0] = 20 * i
+        stack[i, 3:6, i:i + 3] = [255, 255, 255]
+    
+    for mode in ("block", "half"):
+        frames, deltas = encode_deltas(stack, mode)
+        indexed = IndexedFrames.from_stack(stack, mode, lru=3)
+        assert indexed.top.dtype == np.uint8
+        assert list(indexed) == frames
+        assert [indexed.delta(i) for i in range(12)] == deltas
+        assert indexed[-1] == frames[-1]
+        assert len(indexed._encoded) == 3
+        
+        strings = sum(map(sys.getsizeof, frames))
+        assert indexed.memory_bytes() < strings
+    
+    # More colors than uint16 indices can hold
+    from animatedfetching.ansi import encode_frames
+    packed = np.arange(2 * 180 * 200, dtype=np.uint32).reshape(2, 180, 200) * 97
+    many = np.stack([packed >> 16, packed >> 8, packed], axis=-1).astype(np.uint8)
+    indexed = IndexedFrames.from_stack(many)
+    assert len(indexed.encoder.colors) > 65536
+    assert indexed.top.dtype == np.uint32
+    assert list(indexed) == encode_frames(many)
+    
+    gif_path = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        'animatedfetching', 'resources', 'default_animation.gif'
+    )
+    animation = AnimatedGIF(gif_path, width=20, lru=2)
+    assert isinstance(animation.frames, IndexedFrames)
+    assert animation.memory_bytes() > 0
+    
+    print("✓ Indexed frames test passed")
+    return True
+
+
+def test_frame_scheduler():
+    """Test frames are shown at absolute deadlines and dropped when late"""
+    print("Testing frame scheduler...")
+    
+    from animatedfetching.animation import FrameScheduler
+    
+    class FakeClock:
+        def __init__(self):
+            self.now = 100.0
+        
+        def __call__(self):
+            return self.now
+        
+        def sleep(self, seconds):
+            self.now += seconds
+    
+    # Rendering takes 0.03s per frame but never pushes deadlines back
+    clock = FakeClock()
+    shown = []
+    scheduler = FrameScheduler(4, lambda index: 0.1, plays=2, clock=clock, sleep=clock.sleep)
+    for index in scheduler:
+        shown.append((index, round(clock.now - 100.0, 2)))
+        clock.now += 0.03
+    assert shown == [(i % 4, round(i * 0.1, 2)) for i in range(8)]
+    assert scheduler.dropped == 0
+    assert abs(scheduler.elapsed - 0.8) < 1e-9
+    
+    # A slow render skips the frames whose slot has already passed
+    clock = FakeClock()
+    scheduler = FrameScheduler(10, lambda index: 0.1, plays=1, clock=clock, sleep=clock.sleep)
+    shown = []
+    for index in scheduler:
+        shown.append(index)
+        clock.now += 0.25 if index == 2 else 0.01
+    assert shown == [0, 1, 2, 4, 5, 6, 7, 8, 9]
+    stats = scheduler.stats()
+    assert stats['dropped'] == 1 and stats['shown'] == 9
+    assert abs(stats['target_fps'] - 10) < 1e-9
+    
+    # Looping forever stops at the budget
+    clock = FakeClock()
+    scheduler = FrameScheduler(3, lambda index: 0.5, budget=2, clock=clock, sleep=clock.sleep)
+    assert list(scheduler) == [0, 1, 2, 0]
+    assert abs(scheduler.elapsed - 2) < 1e-9
+    
+    # A wake that makes the idle tick short gets the next tick soon after
+    clock = FakeClock()
+    busy = []
+    scheduler = FrameScheduler(1, lambda index: 0.25 if busy else 60.0, clock=clock)
+    
+    def key_sleep(seconds):
+        if not busy and clock.now + seconds >= 101.0:
+            # A key starts a command a second in
+            clock.now = 101.0
+            busy.append(True)
+            scheduler.wake()
+        else:
+            clock.sleep(seconds)
+    
+    scheduler.sleep = key_sleep
+    ticks = []
+    for index in scheduler:
+        ticks.append(round(clock.now - 100.0, 2))
+        if len(ticks) == 4:
+            break
+    assert ticks == [0.0, 1.0, 1.25, 1.5]
+    
+    print("✓ Frame scheduler test passed")
+    return True
+
+
+def test_direct_output():
+    """Test direct output is only used when the layout fits the terminal"""
+    print("Testing direct output...")
+    
+    from rich.console import Console
+    from rich.text import Text
+    from animatedfetching.main import PrerenderedLines
+    
+    app = AnimatedFetching()
+    header = PrerenderedLines(Text("Title"))
+    footer = PrerenderedLines(app._render_footer(False))
+    printed = []
+    with open(os.devnull, 'w') as devnull:
+        # Frames wider than the terminal would wrap; this falls back to Live
+        app.console = Console(file=devnull, force_terminal=True, width=app.animation.width - 10, height=80)
+        assert not app._display_direct(lambda: printed.append(True), header, footer, None)
+        
+        # So does a layout taller than the terminal
+        app.console = Console(file=devnull, force_terminal=True, width=120, height=5)
+        assert not app._display_direct(lambda: printed.append(True), header, footer, None)
+    assert not printed
+
+    # Short writes are continued rather than dropping the rest
+    from animatedfetching.terminal import write_all
+    
+    os_write = os.write
+    read_fd, write_fd = os.pipe()
+    try:
+        os.write = lambda fd, data: os_write(fd, data[:3])
+        write_all(write_fd, "▀\033[m frame".encode('utf-8'))
+    finally:
+        os.write = os_write
+        os.close(write_fd)
+    with os.fdopen(read_fd, 'rb') as stream:
+        assert stream.read().decode('utf-8') == "▀\033[m frame"
+    
+    print("✓ Direct output test passed")
+    return True
+
+
+def test_key_input():
+    """Test keypresses stop the running animation and pick a button"""
+    print("Testing key input...")
+    
+    import io
+    import time
+    from rich.console import Console
+    from animatedfetching.terminal import KeyReader
+    from animatedfetching.animation import FrameScheduler
+    
+    read_fd, write_fd = os.pipe()
+    try:
+        with os.fdopen(read_fd, 'rb', buffering=0) as stream, KeyReader(stream) as keys:
+            start = time.monotonic()
+            assert keys.read(0.05) == []
+            assert time.monotonic() - start >= 0.04
+            os.write(write_fd, b"\033[A")
+            assert keys.read(1) == ['up']
+            os.write(write_fd, b"\033[1;5D")
+            assert keys.read(1) == []
+            
+            # A button's key ends the animation right away, however long the frame
+            app = AnimatedFetching()
+            app.console = Console(file=io.StringIO(), width=120)
+            button = app.config['buttons'][0]
+            os.write(write_fd, b"x" + button['key'].encode())
+            start = time.monotonic()
+            assert app.display(keys=keys) == button
+            assert time.monotonic() - start < 5
+            
+            # So does 'q', or the end of input
+            scheduler = FrameScheduler(1, lambda index: 60)
+            pressed = []
+            scheduler.sleep = app._key_sleep(keys, scheduler, pressed)
+            os.write(write_fd, b"Q")
+            assert list(scheduler) == [0]
+            assert pressed == [None] and scheduler.stopped
+            
+            os.close(write_fd)
+            write_fd = None
+            assert keys.read(1) is None
+    finally:
+        if write_fd is not None:
+            os.close(write_fd)
+    
+    print("✓ Key input test passed")
+    return True
+
+
+def test_jobs():
+    """Test button commands run in the background with their output streamed"""
+    print("Testing background jobs...")
+    
+    import io
+    import sys
+    import time
+    from rich.console import Console
+    from animatedfetching.jobs import JobRunner
+    from animatedfetching.animation import FrameScheduler
+    
+    def wait_for(condition, runner=None):
+        deadline = time.monotonic() + 10
+        while not condition() and time.monotonic() < deadline:
+            (runner or jobs).poll()
+            time.sleep(0.01)
+        assert condition()
+    
+    jobs = JobRunner(history=2)
+    python = f'"{sys.executable}" -c'
+    fast = jobs.start("Fast", f"{python} \"print('one'); print('two'); raise SystemExit(3)\"")
+    slow = jobs.start("Slow", f"{python} \"import time; print('start', flush=True); time.sleep(30)\"")
+    timed = jobs.start("Timed", f"{python} \"import time; time.sleep(30)\"", timeout=0.2)
+    
+    # Several jobs run at once; the running ones are never forgotten
+    assert len(jobs.jobs) == 3 and jobs.current is timed
+    wait_for(lambda: not fast.running and slow.lines)
+    assert fast.snapshot() == ['one', 'two']
+    assert fast.status == "failed" and fast.returncode == 3
+    assert slow.running and jobs.poll() is False
+    
+    wait_for(lambda: not timed.running)
+    assert timed.status == "timed out"
+    assert jobs.cancel() is slow
+    wait_for(lambda: not slow.running)
+    assert slow.status == "cancelled" and not jobs.active()
+    jobs.start("Echo", "echo done")
+    assert fast not in jobs.jobs and len(jobs.jobs) == 2
+    
+    # Finished jobs are only forgotten past the history size
+    history = JobRunner(history=5)
+    for index in range(3):
+        done = history.start(f"Job {index}", "echo done")
+        wait_for(lambda: not done.running, history)
+    history.start("Job 3", "echo done")
+    assert [job.label for job in history.jobs] == ["Job 0", "Job 1", "Job 2", "Job 3"]
+    
+    # The pane keeps its height whatever the output, so rows can be diffed
+    app = AnimatedFetching()
+    app.console = Console(file=io.StringIO(), width=80)
+    app.jobs = JobRunner()
+    height = len(app._capture_lines(app.render_jobs()))
+    job = app.jobs.start("Many", f"{python} \"print(*range(50), sep=chr(10))\"")
+    wait_for(lambda: not job.running and len(job.lines) == 50, app.jobs)
+    lines = app._capture_lines(app.render_jobs())
+    assert len(lines) == height and '49' in lines[-2] and 'done in' in lines[0]
+    assert app.jobs.scroll_by(100, app._pane_height()) and app.jobs.scroll == 44
+    assert '5' in app._capture_lines(app.render_jobs())[-2]
+    
+    # Waking redraws the frame on screen without waiting for the next one
+    scheduler = FrameScheduler(2, lambda index: 60)
+    scheduler.sleep = lambda seconds: scheduler.wake()
+    frames = iter(scheduler)
+    assert [next(frames), next(frames)] == [0, 0]
+    assert scheduler.shown == 1
+    
+    print("✓ Background jobs test passed")
+    return True
+
+
+def test_daemon():
+    """Test a plain fetch is served by a running daemon, or falls back"""
+    print("Testing daemon...")
+    
+    import json
+    import tempfile
+    import threading
+    from animatedfetching.daemon import Daemon, request, encode_request, decode_request, peer_uid
+    
+    lines = encode_request(100, 30, True, {'TERM': "xterm", 'HOME': "/root"}).decode().splitlines()
+    assert lines[-1] == ""
+    message = decode_request(lines[:-1])
+    assert message == {'width': 100, 'height': 30, 'tty': True, 'env': {'TERM': "xterm"}}
+    assert decode_request(["afetch 0.0.0"]) is None
+    assert decode_request(lines[:1] + ["width wide"]) is None
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config_path = os.path.join(temp_dir, 'config.jsonc')
+        with open(config_path, 'w') as f:
+            json.dump({"animation": {"enabled": False}, "cache": {"enabled": False},
+                       "layout": {"title": "Daemon Test"}}, f)
+        path = os.path.join(temp_dir, 'afetch.sock')
+        
+        with tempfile.TemporaryFile() as out:
+            assert request(path, out) is False
+        
+        daemon = Daemon(config_path, path)
+        ready = threading.Event()
+        thread = threading.Thread(target=daemon.serve_forever, kwargs={'ready': ready.set})
+        thread.start()
+        try:
+            assert ready.wait(30)
+            try:
+                Daemon(config_path, path)._listen()
+                assert False, "a second daemon must not take over the socket"
+            except RuntimeError:
+                pass
+            with tempfile.TemporaryFile() as out:
+                assert request(path, out) is True
+                out.seek(0)
+                assert b"Daemon Test" in out.read()
+            
+            # Sockets other users could have made or can reach are never used
+            link = os.path.join(temp_dir, 'link.sock')
+            os.symlink(path, link)
+            os.chmod(path, 0o777)
+            with tempfile.TemporaryFile() as out:
+                assert request(path, out) is False
+                os.chmod(path, 0o700)
+                assert request(link, out) is False
+                assert out.tell() == 0
+            import socket
+            with socket.socket(socket.AF_UNIX) as sock:
+                sock.connect(path)
+                assert peer_uid(sock) in (None, os.getuid())
+            
+            # Variables the client doesn't send are unset, not the daemon's own
+            os.environ['NO_COLOR'] = "1"
+            try:
+                with socket.socket(socket.AF_UNIX) as sock:
+                    sock.connect(path)
+                    sock.sendall(encode_request(80, 25, True, {'TERM': "xterm-256color"}))
+                    output = b"".join(iter(lambda: sock.recv(65536), b""))
+            finally:
+                del os.environ['NO_COLOR']
+            assert b"Daemon Test" in output and b"\033[1;36m" in output
+            
+            # Config changes are picked up on the next request
+            with open(config_path, 'w') as f:
+                json.dump({"animation": {"enabled": False}, "cache": {"enabled": False},
+                           "layout": {"title": "Reloaded"}}, f)
+            os.utime(config_path, ns=(0, 0))
+            with tempfile.TemporaryFile() as out:
+                assert request(path, out) is True
+                out.seek(0)
+                assert b"Reloaded" in out.read()
+        finally:
+            daemon.shutdown()
+            thread.join()
+        assert not os.path.exists(path)
+    
+    print("✓ Daemon test passed")
+    return True
+
+
+def test_snapshot():
+    """Test login snapshots are per width and invalidated by age and source changes"""
+    print("Testing login snapshot...")
+    
+    import io
+    import json
+    import tempfile
+    from rich.console import Console
+    from animatedfetching.snapshot import Snapshot
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config_path = os.path.join(temp_dir, 'config.jsonc')
+        with open(config_path, 'w') as f:
+            json.dump({"animation": {"enabled": False}, "cache": {"enabled": False},
+                       "snapshot": {"enabled": True, "max_age": 60}}, f)
+        
+        snapshot = Snapshot(config_path, 100, cache_dir=temp_dir)
+        assert snapshot.load() is None
+        snapshot.store("output", [config_path], 60, now=1000)
+        assert snapshot.load(now=1030) == b"output"
+        assert snapshot.load(now=1061) is None
+        assert Snapshot(config_path, 80, cache_dir=temp_dir).load(now=1030) is None
+        
+        # Editing the config invalidates it
+        os.utime(config_path, ns=(0, 0))
+        assert snapshot.load(now=1030) is None
+        
+        # A run renders the static output for the given width
+        app = AnimatedFetching(config_path=config_path)
+        app.console = Console(file=io.StringIO(), width=120)
+        stored = []
+        original_store = Snapshot.store
+        Snapshot.store = lambda self, output, sources, max_age, now=None: stored.append(
+            (self.path, output, sources, max_age))
+        try:
+            app.save_snapshot(100)
+        finally:
+            Snapshot.store = original_store
+        (path, output, sources, max_age), = stored
+        assert path == Snapshot(config_path, 100).path
+        assert "System Information" in output and "\033[" in output
+        assert sources == [os.path.realpath(config_path)] and max_age == 60
+        
+        assert Snapshot.clear(temp_dir) == 1
+        assert snapshot.load() is None
+    
+    print("✓ Login snapshot test passed")
+    return True
+
+
+def test_prerendered_lines():
+    """Test static layout is rendered once per width and replayed unchanged"""
+    print("Testing prerendered lines...")
+    
+    import io
+    from rich.console import Console
+    from rich.table import Table
+    from animatedfetching.main import PrerenderedLines
+    
+    class CountingTable(Table):
+        renders = 0
+        
+        def __rich_console__(self, console, options):
+            CountingTable.renders += 1
+            yield from super().__rich_console__(console, options)
+    
+    table = CountingTable(show_header=False)
+    table.add_column()
+    table.add_column()
+    table.add_row("OS", "Linux")
+    cached = PrerenderedLines(table)
+    
+    def render(renderable, width):
+        buffer = io.StringIO()
+        Console(file=buffer, width=width, force_terminal=True).print(renderable)
+        return buffer.getvalue()
+    
+    expected = render(table, 40)
+    CountingTable.renders = 0
+    assert render(cached, 40) == expected
+    assert render(cached, 40) == expected
+    assert CountingTable.renders == 1
+    
+    render(cached, 60)
+    assert CountingTable.renders == 2
+    cached.invalidate()
+    render(cached, 60)
+    assert CountingTable.renders == 3
+    
+    print("✓ Prerendered lines test passed")
+    return True
+
+
+def test_formats():
+    """Test --format output streams values as collectors finish, without rich"""
+    print("Testing output formats...")
+    
+    import io
+    import json
+    import time
+    from animatedfetching.sysinfo import Collection
+    from animatedfetching import formats
+    
+    def fail():
+        raise OSError("no such mount")
+    
+    collectors = {
+        'slow': lambda: time.sleep(0.1) or "late",
+        'hung': lambda: time.sleep(5) or "never",
+        'fast': lambda: "ok",
+        'broken': fail,
+    }
+    collection = Collection(collectors, {'hung': 0.3}, {'hung': "last"}, 4, known={'cached': "kept"})
+    start = time.monotonic()
+    pairs = list(collection.as_completed())
+    assert time.monotonic() - start < 1.0
+    assert pairs[0] == ('cached', "kept")
+    assert pairs[-2:] == [('slow', "late"), ('hung', "last")]
+    assert dict(pairs) == {'cached': "kept", 'slow': "late", 'hung': "last", 'fast': "ok",
+                           'broken': SystemInfo.PLACEHOLDER}
+    assert collection.timed_out == ['hung'] and collection.failed == ['broken']
+    
+    assert formats.sgr("bold cyan") == "\033[1;36m"
+    assert formats.sgr("#ff0000 on blue") == "\033[34m"
+    assert formats.sgr("") == ""
+    assert formats.parse_args(['--format', 'json']) == ('json', None)
+    assert formats.parse_args(['--format=plain', '-c', 'x.jsonc']) == ('plain', 'x.jsonc')
+    assert formats.parse_args(['--format', 'xml']) is None
+    assert formats.parse_args(['--format', 'json', '-w']) is None
+    
+    config = {
+        "layout": {"show_hostname": False},
+        "info_sections": [{"label": "Shell", "key": "shell", "color": "yellow"},
+                          {"label": "Term", "key": "terminal"}],
+        "cache": {"enabled": False},
+    }
+    out = io.StringIO()
+    formats.write(config, 'json', out)
+    assert set(json.loads(out.getvalue())) == {'shell', 'terminal'}
+    
+    out = io.StringIO()
+    formats.write(config, 'plain', out)
+    assert sorted(out.getvalue().splitlines()) == sorted([
+        f"Shell: {SystemInfo.get_shell()}", f"Term: {SystemInfo.get_terminal()}"])
+    
+    out = io.StringIO()
+    formats.write(config, 'ansi', out)
+    assert f"\033[1;33mShell\033[m: {SystemInfo.get_shell()}" in out.getvalue().splitlines()
+    
+    out = io.StringIO()
+    formats.write(dict(config, info_sections=[], layout={"show_hostname": False}), 'json', out)
+    assert json.loads(out.getvalue()) == {}
+    
+    print("✓ Output formats test passed")
+    return True
+
+
+def test_lazy_imports():
+    """Test heavy dependencies are only imported by the code that needs them"""
+    print("Testing lazy imports...")
+    
+    import json
+    import subprocess
+    import tempfile
+    
+    root = os.path.dirname(os.path.abspath(__file__))
+    gif_path = os.path.join(root, 'animatedfetching', 'resources', 'default_animation.gif')
+    heavy = ('numpy', 'PIL', 'psutil', 'distro', 'jsoncomment')
+    
+    def imported(code, *args):
+        result = subprocess.run(
+            [sys.executable, '-c', code + "\nimport sys, json; print(json.dumps(sorted(sys.modules)))", *args],
+            cwd=root, capture_output=True, text=True, check=True
+        )
+        modules = json.loads(result.stdout.splitlines()[-1])
+        return {module.split('.')[0] for module in modules}
+    
+    assert not imported("import animatedfetching.main") & set(heavy)
+    fetch = "import sys\nsys.argv[1:] = ['--format', 'json']\nfrom animatedfetching.daemon import launch\nlaunch()"
+    assert not imported(fetch) & {'rich', 'numpy', 'PIL'}
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        load = (
+            "import sys\n"
+            "from animatedfetching.animation import AnimatedGIF\n"
+            "from animatedfetching.cache import FrameCache\n"
+            "assert AnimatedGIF(sys.argv[1], cache=FrameCache(sys.argv[2])).get_frame_count()"
+        )
+        assert {'numpy', 'PIL'} <= imported(load, gif_path, temp_dir)
+        assert not imported(load, gif_path, temp_dir) & {'numpy', 'PIL'}
+    
+    print("✓ Lazy imports test passed")
+    return True
+
+
+def test_timings():
+    """Test --timings records phases, collectors and playback, and is inert when disabled"""
+    print("Testing timings...")
+    
+    import io
+    import json
+    import tempfile
+    from rich.console import Console
+    from animatedfetching.timings import Timings
+    
+    now = [0.0]
+    timings = Timings(enabled=True, clock=lambda: now[0])
+    with timings.phase('display'):
+        now[0] += 1.0
+        with timings.phase('display.write'):
+            now[0] += 0.25
+    with timings.phase('display.write'):
+        now[0] += 0.25
+    timings.count('bytes_written', 10)
+    timings.count('bytes_written', 5)
+    report = timings.report()
+    assert list(report['phases_ms']) == ['display', 'display.write']
+    assert report['phases_ms'] == {'display': 1250.0, 'display.write': 500.0}
+    assert report['total_ms'] == 1500.0 and report['bytes_written'] == 15
+    assert "    write" in "\n".join(Timings.format(report))
+    
+    disabled = Timings()
+    with disabled.phase('display'):
+        disabled.count('bytes_written', 10)
+        disabled.set('frames', 3)
+    assert disabled.phase('a') is disabled.phase('b')
+    assert not disabled.phases and not disabled.counters and not disabled.values
+    stream = io.StringIO()
+    assert disabled.wrap(stream) is stream
+    
+    gif_path = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)),
+        'animatedfetching', 'resources', 'default_animation.gif'
+    )
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config_path = os.path.join(temp_dir, 'config.jsonc')
+        with open(config_path, 'w') as f:
+            json.dump({"animation": {"enabled": True, "path": gif_path, "width": 10},
+                       "cache": {"enabled": False}}, f)
+        
+        app = AnimatedFetching(config_path=config_path, timings=Timings(enabled=True))
+        app.console = Console(file=app.timings.wrap(io.StringIO()), width=100)
+        app.playback_stats = {'shown': 3, 'dropped': 1, 'elapsed': 0.3,
+                              'actual_fps': 10.0, 'target_fps': 13.3}
+        app._display_static()
+        report = app.timings_report()
+        app.close()
+        
+        assert {'config', 'animation', 'animation.decode', 'animation.convert', 'sysinfo'} <= set(report['phases_ms'])
+        assert set(report['collectors_ms']) == set(app.sysinfo) - set(report['failed'] + report['timed_out'])
+        assert report['frames'] == report['frames_decoded'] > 1
+        assert report['frames_shown'] == 3 and report['frames_dropped'] == 1
+        assert report['bytes_written'] > 0
+        assert report['peak_rss_bytes'] is None or report['peak_rss_bytes'] > 0
+        json.dumps(report)
+    
+    print("✓ Timings test passed")
+    return True
+
+
 def main():
     """Run all tests"""
     print("=" * 60)
@@ -160,10 +1370,33 @@ def main():
     
     tests = [
         test_sysinfo,
+        test_sysinfo_timeouts,
+        test_sysinfo_cache,
+        test_sysinfo_refresher,
+        test_collector_registry,
         test_config,
+        test_config_cache,
         test_app_initialization,
         test_display,
         test_first_run_setup,
+        test_ansi_conversion,
+        test_frame_cache,
+        test_streaming_frames,
+        test_half_block_mode,
+        test_delta_frames,
+        test_decode_limits,
+        test_color_depths,
+        test_indexed_frames,
+        test_frame_scheduler,
+        test_direct_output,
+        test_key_input,
+        test_jobs,
+        test_daemon,
+        test_snapshot,
+        test_prerendered_lines,
+        test_timings,
+        test_formats,
+        test_lazy_imports,
     ]
     
     results = []